@@ -0,0 +1,183 @@
+#!/usr/bin/python3
+"""
+Throughput and p50/p99 latency of the Venmo clients against the local mock server, no network or credentials needed
+
+python benchmarks/bench.py --latency 0.005 --requests 500
+python benchmarks/bench.py --json > before.json
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from venmo import Venmo, AsyncVenmo, VenmoPool, RetryPolicy, RecordingAdapter, ReplayAdapter  # noqa: E402
+from mock_server import MockVenmoServer  # noqa: E402
+
+
+def percentile(samples, q):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else None
+
+
+def result(name, operations, elapsed, samples):
+    return {
+        'benchmark': name,
+        'operations': operations,
+        'seconds': elapsed,
+        'ops_per_second': operations / elapsed if elapsed else None,
+        'p50_ms': None if not samples else percentile(samples, 0.5) * 1000,
+        'p99_ms': None if not samples else percentile(samples, 0.99) * 1000,
+    }
+
+
+def timed_calls(fn, count):
+    samples = []
+    started = time.perf_counter()
+    for _ in range(count):
+        call_started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - call_started)
+    return time.perf_counter() - started, samples
+
+
+def logged_in(server, **kwargs):
+    venmo = Venmo(retry=RetryPolicy(backoff=0.001), **kwargs)
+    venmo.base_urls = server.base_urls
+    venmo.login('user-0', 'password')
+    return venmo
+
+
+def bench_sync(server, args):
+    venmo = logged_in(server)
+    elapsed, samples = timed_calls(venmo.get_account, args.requests)
+    return result('sync get_account', args.requests, elapsed, samples)
+
+
+def bench_sync_cached(server, args):
+    venmo = logged_in(server)
+    venmo.enable_cache()
+    elapsed, samples = timed_calls(venmo.get_account, args.requests)
+    return result('sync get_account cached', args.requests, elapsed, samples)
+
+
+def bench_pagination(server, args):
+    venmo = logged_in(server)
+    samples = []
+    started = time.perf_counter()
+    last = started
+    count = 0
+    for _ in venmo.iter_stories():
+        now = time.perf_counter()
+        samples.append(now - last)
+        last = now
+        count += 1
+    return result('sync iter_stories per item', count, time.perf_counter() - started, samples)
+
+
+def bench_replay(server, args):
+    """
+    Client side overhead alone - header building, decoding and paging - served from a cassette of the mock server
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        recorder = RecordingAdapter(os.path.join(directory, 'bench.cassette'))
+        logged_in(server, transport=recorder).get_account()
+        recorder.save()
+        venmo = Venmo(transport=ReplayAdapter(recorder.cassette))
+        venmo.login('user-0', 'password')
+        elapsed, samples = timed_calls(venmo.get_account, args.requests)
+    return result('replayed get_account', args.requests, elapsed, samples)
+
+
+def bench_pool(server, args):
+    with VenmoPool(max_workers=args.workers, retry=RetryPolicy(backoff=0.001)) as pool:
+        for i in range(args.accounts):
+            pool.add(f'user-{i}', 'password').base_urls = server.base_urls
+        list(pool.login())
+        calls = ('get_account', 'get_alerts', 'get_payment_methods')
+        rounds = max(1, args.requests // (args.accounts * len(calls)))
+        samples = []
+        started = time.perf_counter()
+        operations = 0
+        for _ in range(rounds):
+            round_started = time.perf_counter()
+            for pool_result in pool.run(*calls):
+                if pool_result.error is not None:
+                    raise pool_result.error
+                samples.append(time.perf_counter() - round_started)
+                operations += 1
+        return result(f'pool {args.accounts} accounts x {len(calls)} calls', operations, time.perf_counter() - started, samples)
+
+
+def bench_async(server, args):
+    try:
+        import httpx  # noqa: F401
+    except ImportError:
+        return None
+
+    async def run():
+        async with AsyncVenmo(retry=RetryPolicy(backoff=0.001)) as venmo:
+            venmo.base_urls = server.base_urls
+            await venmo.login('user-0', 'password')
+            samples = []
+
+            async def call():
+                call_started = time.perf_counter()
+                await venmo.get_account()
+                samples.append(time.perf_counter() - call_started)
+            started = time.perf_counter()
+            for offset in range(0, args.requests, args.workers):
+                await asyncio.gather(*(call() for _ in range(min(args.workers, args.requests - offset))))
+            return result(f'async get_account x{args.workers} concurrent', args.requests, time.perf_counter() - started, samples)
+    return asyncio.run(run())
+
+
+BENCHMARKS = {
+    'sync': bench_sync,
+    'sync-cached': bench_sync_cached,
+    'pagination': bench_pagination,
+    'replay': bench_replay,
+    'pool': bench_pool,
+    'async': bench_async,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('benchmarks', nargs='*', help=f'any of {", ".join(BENCHMARKS)}, all when omitted')
+    parser.add_argument('--requests', type=int, default=300, help='calls per benchmark')
+    parser.add_argument('--latency', type=float, default=0.0, help='mock server seconds per response')
+    parser.add_argument('--items', type=int, default=2000, help='items in every paginated listing')
+    parser.add_argument('--payload-size', type=int, default=256, help='padding bytes per listing item')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fraction of responses that are 503s')
+    parser.add_argument('--accounts', type=int, default=10)
+    parser.add_argument('--workers', type=int, default=10)
+    parser.add_argument('--json', action='store_true', help='print machine readable results')
+    args = parser.parse_args()
+    unknown = set(args.benchmarks) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f'unknown benchmarks: {", ".join(sorted(unknown))}')
+
+    results = []
+    with MockVenmoServer(latency=args.latency, items=args.items, payload_size=args.payload_size,
+                         error_rate=args.error_rate) as server:
+        for name in args.benchmarks or BENCHMARKS:
+            outcome = BENCHMARKS[name](server, args)
+            if outcome is not None:
+                results.append(outcome)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f'{"benchmark":<40} {"ops":>8} {"ops/s":>10} {"p50 ms":>9} {"p99 ms":>9}')
+    for row in results:
+        print(f'{row["benchmark"]:<40} {row["operations"]:>8} {row["ops_per_second"]:>10.1f} '
+              f'{row["p50_ms"]:>9.3f} {row["p99_ms"]:>9.3f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+#!/usr/bin/python3
+"""
+Cold import cost of the venmo package, exits non-zero when over budget so it can gate CI
+
+python benchmarks/import_time.py
+python benchmarks/import_time.py --package-budget 5 --client-budget 200
+"""
+import os
+import sys
+import json
+import argparse
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = """
+import time
+started = time.perf_counter()
+import venmo
+imported = time.perf_counter()
+venmo.Venmo
+loaded = time.perf_counter()
+import sys, json
+print(json.dumps({'package': imported - started, 'client': loaded - imported,
+                  'heavy': sorted(m for m in ('requests', 'asyncio', 'sqlite3', 'httpx') if m in sys.modules)}))
+"""
+
+
+def measure(runs):
+    """
+    :return: dict - best of `runs` fresh interpreters, in milliseconds
+    """
+    best = {}
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, '-c', PROBE], cwd=ROOT, check=True, capture_output=True, text=True).stdout
+        sample = json.loads(output)
+        for key in ('package', 'client'):
+            best[key] = min(best.get(key, float('inf')), sample[key] * 1000)
+        best['heavy'] = sample['heavy']
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--package-budget', type=float, default=10.0, help='ms allowed for `import venmo`')
+    parser.add_argument('--client-budget', type=float, default=300.0, help='ms allowed to then load venmo.Venmo')
+    args = parser.parse_args()
+
+    result = measure(args.runs)
+    print(f'import venmo    {result["package"]:8.2f} ms  (budget {args.package_budget} ms)')
+    print(f'venmo.Venmo     {result["client"]:8.2f} ms  (budget {args.client_budget} ms)')
+    print(f'loaded with Venmo: {", ".join(result["heavy"])}')
+    if result['package'] > args.package_budget or result['client'] > args.client_budget:
+        sys.exit('import time over budget')
+
+
+if __name__ == '__main__':
+    main()
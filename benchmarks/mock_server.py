@@ -0,0 +1,203 @@
+#!/usr/bin/python3
+"""
+Local stand-in for the venmo.com and api.venmo.com endpoints used by the venmo package
+
+server = MockVenmoServer(latency=0.02, items=5000, error_rate=0.01).start()
+venmo = Venmo()
+venmo.base_urls = server.base_urls
+...
+server.stop()
+"""
+import re
+import json
+import time
+import random
+import argparse
+import threading
+from urllib.parse import urlsplit, parse_qsl
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class MockVenmoServer:
+    """
+    :param latency: float - seconds every response is held back
+    :param jitter: float - extra random seconds, up to, added to latency
+    :param items: int - length of the stories, payments, friends and authorizations listings
+    :param page_size: int - listing items per page unless the request asks for a smaller limit
+    :param payload_size: int - bytes of padding in every listing item, to emulate large responses
+    :param error_rate: float - fraction of requests answered 503 with Retry-After: 0
+    """
+    def __init__(self, host='127.0.0.1', port=0, latency=0.0, jitter=0.0, items=1000, page_size=50,
+                 payload_size=256, error_rate=0.0):
+        self.latency = latency
+        self.jitter = jitter
+        self.items = items
+        self.page_size = page_size
+        self.payload_size = payload_size
+        self.error_rate = error_rate
+        self.requests = 0
+        self.httpd = ThreadingHTTPServer((host, port), self._handler())
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f'http://{host}:{port}'
+
+    @property
+    def base_urls(self):
+        """
+        Value for VenmoBase.base_urls, both hosts are served from the same port since their paths don't overlap
+        """
+        return {'venmo.com': self.url, 'api.venmo.com': self.url}
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name='mock-venmo', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def user(self, i):
+        return {
+            'id': str(1000 + i),
+            'username': f'user-{i}',
+            'display_name': f'User {i}',
+            'first_name': 'User',
+            'last_name': str(i),
+            'phone': f'+1555{i:07d}',
+            'email': f'user-{i}@example.com',
+            'is_active': True,
+            'about': 'x' * self.payload_size,
+        }
+
+    def payment(self, i, action='pay', status='settled'):
+        return {
+            'id': str(500000 + i),
+            'action': action,
+            'status': status,
+            'amount': round(1 + i % 97 * 1.25, 2),
+            'note': 'x' * self.payload_size,
+            'audience': 'private',
+            'date_created': time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(1700000000 - i * 3600)),
+            'actor': self.user(0),
+            'target': {'type': 'user', 'user': self.user(i % 500 + 1)},
+        }
+
+    def story(self, i):
+        return {
+            'id': str(900000 + i),
+            'type': 'payment',
+            'date_updated': time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(1700000000 - i * 3600)),
+            'audience': 'private',
+            'note': 'x' * self.payload_size,
+            'payment': self.payment(i),
+        }
+
+    def listing(self, url, query, make):
+        """
+        Page of `make(i)` items newest first, paginated with a before_id cursor like the real API
+        """
+        limit = min(int(query.get('limit', self.page_size)), self.page_size)
+        start = int(query.get('before_id', 0))
+        end = min(start + limit, self.items)
+        page = {'data': [make(i) for i in range(start, end)], 'pagination': {}}
+        if end < self.items:
+            query = dict(query, before_id=end)
+            page['pagination']['next'] = f'{self.url}{urlsplit(url).path}?' + '&'.join(f'{k}={v}' for k, v in query.items())
+        return page
+
+    def route(self, method, url):
+        """
+        :return: tuple - (status, body) answering `method` `url`
+        """
+        parts = urlsplit(url)
+        path, query = parts.path, dict(parse_qsl(parts.query))
+        if method == 'POST' and path == '/api/v5/oauth/access_token':
+            return 200, {'username': 'user-0', 'phone': '+15550000000', 'name': 'User 0', 'access_token': 'mock-token',
+                         'balance': '0.00', 'id': '1000', 'email': 'user-0@example.com'}
+        if method == 'GET' and path == '/api/v5/users/me':
+            return 200, dict(self.user(0), external_id='1000')
+        if method == 'GET' and path == '/v1/stories/target-or-actor/friends':
+            return 200, self.listing(url, query, self.story)
+        if method == 'GET' and path == '/v1/payments':
+            action, status = query.get('action', 'pay'), query.get('status', 'pending').split(',')[0]
+            return 200, self.listing(url, query, lambda i: self.payment(i, action, status))
+        if method == 'GET' and path == '/v1/authorizations':
+            return 200, self.listing(url, query, lambda i: {'id': str(i), 'status': 'captured', 'merchant': self.user(i)})
+        if method == 'GET' and re.fullmatch(r'/v1/users/[^/]+/friends', path):
+            return 200, self.listing(url, query, self.user)
+        if method == 'GET' and path == '/v1/users':
+            return 200, {'data': [self.user(hash(query.get('query')) % self.items)]}
+        if method == 'GET' and path == '/v1/account':
+            return 200, {'data': {'balance': '0.00', 'user': self.user(0)}}
+        if method == 'GET' and path == '/v1/hermes-whitelist':
+            return 200, {'data': []}
+        if method == 'GET' and path in ('/v1/alerts', '/v1/suggested', '/v1/users/merchant-payments-activation-views',
+                                        '/v1/payment-methods', '/v1/blocks', '/api/v5/bankaccounts', '/api/v5/devices'):
+            return 200, {'data': []}
+        if method in ('POST', 'PUT', 'DELETE') and (path.startswith('/api/v5/') or path.startswith('/v1/')):
+            return 200, {'data': {}}
+        return 404, {'error': {'message': 'Resource not found.'}}
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # Headers and body are written separately, without this delayed ACKs add ~40ms per response
+            disable_nagle_algorithm = True
+
+            def _respond(self):
+                server.requests += 1
+                length = int(self.headers.get('Content-Length') or 0)
+                if length:
+                    self.rfile.read(length)
+                delay = server.latency + random.uniform(0, server.jitter)
+                if delay:
+                    time.sleep(delay)
+                headers = {}
+                if server.error_rate and random.random() < server.error_rate:
+                    status, body = 503, {'error': {'message': 'Service unavailable'}}
+                    headers['Retry-After'] = '0'
+                else:
+                    status, body = server.route(self.command, self.path)
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json; charset=utf-8')
+                self.send_header('Content-Length', str(len(data)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            do_GET = do_POST = do_PUT = do_DELETE = _respond
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Serve the mock Venmo API until interrupted')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--items', type=int, default=1000)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    args = parser.parse_args()
+    mock = MockVenmoServer(port=args.port, latency=args.latency, items=args.items, error_rate=args.error_rate)
+    print(f'Serving mock Venmo API on {mock.url}')
+    try:
+        mock.httpd.serve_forever()
+    except KeyboardInterrupt:
+        mock.stop()
@@ -0,0 +1,71 @@
+"""
+Unofficial Venmo API client
+
+Importing the package has no side effects and loads nothing heavy, each name below is imported from its
+submodule on first access - requests is only loaded with Venmo, asyncio with AsyncVenmo and sqlite3 with the
+token stores
+"""
+import importlib
+
+_EXPORTS = {
+    'Venmo':              'client',
+    'VenmoBase':          'base',
+    'AsyncVenmo':         'aio',
+    'async_client':       'aio',
+    'VenmoPool':          'pool',
+    'PoolResult':         'pool',
+    'ENDPOINTS':          'endpoints',
+    'Endpoint':           'endpoints',
+    'BASE_URLS':          'endpoints',
+    'USER_AGENT':         'endpoints',
+    'TTLCache':           'cache',
+    'CACHE_TTLS':         'cache',
+    'CACHE_INVALIDATES':  'cache',
+    'RateLimiter':        'governor',
+    'RetryPolicy':        'governor',
+    'GovernedSession':    'governor',
+    'Instrumentation':    'instrumentation',
+    'RequestEvent':       'instrumentation',
+    'StatsSink':          'instrumentation',
+    'PrometheusSink':     'instrumentation',
+    'CallbackSink':       'instrumentation',
+    'TokenStore':         'store',
+    'FileTokenStore':     'store',
+    'SqliteTokenStore':   'store',
+    'Model':              'models',
+    'User':               'models',
+    'Story':              'models',
+    'Payment':            'models',
+    'PaymentMethod':      'models',
+    'Device':             'models',
+    'ArrayStream':        'jsonstream',
+    'SyncStore':          'sync',
+    'SyncEngine':         'sync',
+    'PaymentInstruction': 'bulk',
+    'PaymentResult':      'bulk',
+    'PaymentJournal':     'bulk',
+    'UserResolver':       'resolve',
+    'ResolveError':       'resolve',
+    'Watcher':            'watch',
+    'WatchEvent':         'watch',
+    'export_accounts':    'export',
+    'RecordingAdapter':   'transport',
+    'ReplayAdapter':      'transport',
+    'SingleFlight':       'coalesce',
+    'AsyncSingleFlight':  'coalesce',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    value = getattr(importlib.import_module(f'.{module}', __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,295 @@
+import time
+import asyncio
+import weakref
+
+from .base import VenmoBase
+from .coalesce import AsyncSingleFlight
+from .endpoints import (ENDPOINTS, csrftoken_from, endpoint_binder, endpoint_methods, named, next_page_url,
+                        two_factor_page_headers, two_factor_sms_headers, two_factor_token_headers)
+from .governor import RetryPolicy
+from .instrumentation import RequestEvent
+
+
+def async_client(max_connections=100, max_keepalive_connections=20, timeout=30.0, http2=False):
+    """
+    Connection pooled transport to share between AsyncVenmo instances, requires httpx
+
+    :param max_connections: int - upper bound of open connections across every account using the client
+    :param http2: bool - multiplex concurrent requests over one connection per host, requires httpx[http2]
+    """
+    import httpx
+    limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_keepalive_connections)
+    return httpx.AsyncClient(limits=limits, timeout=timeout, http2=http2)
+
+
+_shared_clients = weakref.WeakKeyDictionary()  # event loop: ({http2: httpx.AsyncClient}, closer)
+
+
+async def shared_async_client(http2=False):
+    """
+    The running event loop's client, every AsyncVenmo created without one shares it
+
+    An httpx client's connections belong to the loop they were opened on, so every loop gets its own,
+    closed when asyncio.run shuts the loop down
+    """
+    loop = asyncio.get_running_loop()
+    entry = _shared_clients.get(loop)
+    if entry is None:
+        # asyncio.run finalizes the async generators still suspended before closing the loop
+        entry = _shared_clients[loop] = ({}, _close_shared_clients())
+        await entry[1].__anext__()
+    clients = entry[0]
+    client = clients.get(http2)
+    if client is None or client.is_closed:
+        client = clients[http2] = async_client(http2=http2)
+    return client
+
+
+async def _close_shared_clients():
+    try:
+        yield
+    finally:
+        clients, _ = _shared_clients.pop(asyncio.get_running_loop(), ({}, None))
+        for client in clients.values():
+            await client.aclose()
+
+
+@endpoint_methods
+class AsyncVenmo(VenmoBase):
+    """
+    asyncio mirror of Venmo - every method is a coroutine with the same arguments and return value
+
+    Instances created without a client share one pooled transport per event loop so a single loop
+    can drive many logged in accounts concurrently
+    """
+    def __init__(self, client=None, retry=None, rate_limiter=None, instrumentation=None, token_ttl=None, http2=False,
+                 coalesce=True):
+        """
+        :param client: httpx.AsyncClient - eg. async_client() shared between accounts, left open by aclose,
+                       the running loop's shared_async_client() when None
+        :param retry: RetryPolicy - RetryPolicy() defaults when None
+        :param rate_limiter: RateLimiter - eg. one shared with sync clients and other accounts, unlimited when None
+        :param instrumentation: Instrumentation - receives a RequestEvent per request and body decode, off when None
+        :param token_ttl: float - seconds an access token lasts when the login response doesn't say, see Venmo
+        :param http2: bool - share the process wide HTTP/2 client, pass it too along with a client made by
+                      async_client(http2=True)
+        :param coalesce: bool - identical GETs issued while one is in flight share its response, see Venmo
+        """
+        super().__init__()
+        self.instrumentation = instrumentation
+        self.http2 = http2
+        self.client = client
+        self._warm_up_task = None
+        self.coalescer = AsyncSingleFlight() if coalesce else None
+        self.retry = RetryPolicy() if retry is None else retry
+        self.rate_limiter = rate_limiter
+        self.token_ttl = token_ttl
+        self._auth_lock = asyncio.Lock()
+        self._reauthenticating = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def aclose(self):
+        """
+        Clients are never closed here, they may be shared - close one passed in once every account is done with it
+        """
+        if self._warm_up_task is not None:
+            self._warm_up_task.cancel()
+
+    async def _client(self):
+        return self.client if self.client is not None else await shared_async_client(self.http2)
+
+    async def _request(self, method, url, **kwargs):
+        """
+        GovernedSession.request counterpart, waiting with asyncio.sleep so the event loop keeps running
+        """
+        client = await self._client()
+        attempt = 0
+        while True:
+            if self.rate_limiter is not None:
+                wait = self.rate_limiter.reserve()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+            if self.http2 and 'Connection' in kwargs.get('headers', ()):
+                kwargs['headers'] = {name: value for name, value in kwargs['headers'].items() if name != 'Connection'}
+            try:
+                response = await client.request(method, url, **kwargs)
+            except Exception as e:
+                if not type(e).__module__.startswith('httpx') or not self.retry.should_retry(attempt, method, error=e):
+                    raise
+                delay = self.retry.delay(attempt)
+            else:
+                if not self.retry.should_retry(attempt, method, status=response.status_code):
+                    return response
+                delay = self.retry.delay(attempt, response.headers)
+                if response.status_code == 429 and self.rate_limiter is not None:
+                    self.rate_limiter.pause(delay)
+                await response.aclose()
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def _send(self, name, method, url, **kwargs):
+        if self.instrumentation is None:
+            return await self._request(method, url, **kwargs)
+        started = time.perf_counter()
+        marks = {}
+
+        async def trace(event, info):
+            # httpcore reports connection setup and response phases of the last attempt
+            if event in ('connection.connect_tcp.started', 'connection.start_tls.complete', 'connection.connect_tcp.complete'):
+                marks[event] = time.perf_counter()
+            elif event.endswith('receive_response_headers.complete'):
+                marks['headers'] = time.perf_counter()
+        try:
+            response = await self._request(method, url, extensions={'trace': trace}, **kwargs)
+        except Exception as e:
+            self.instrumentation.record(RequestEvent(name, method, error=type(e).__name__, total=time.perf_counter() - started))
+            raise
+        connect = None
+        if 'connection.connect_tcp.started' in marks:
+            connected = marks.get('connection.start_tls.complete') or marks.get('connection.connect_tcp.complete')
+            connect = connected - marks['connection.connect_tcp.started'] if connected else None
+        ttfb = marks['headers'] - started if 'headers' in marks else None
+        self.instrumentation.record(RequestEvent(name, method, response.status_code, len(response.content),
+                                                 connect=connect, ttfb=ttfb, total=time.perf_counter() - started))
+        return response
+
+    async def _call(self, name, params=None, json=None, url=None, **path_params):
+        if self._token_expiring():
+            authorization = self._authorization()
+            if not await self._reauthenticate(authorization):
+                self._unrenewable = authorization
+        method, request_url, headers = self._endpoint(name, url=url, **path_params)
+        response = await self._fetch(name, method, request_url, params, json, headers)
+        if (response.status_code == 401 and name not in self.NO_REAUTHENTICATION
+                and await self._reauthenticate(headers.get('Authorization'))):
+            method, request_url, headers = self._endpoint(name, url=url, **path_params)
+            response = await self._fetch(name, method, request_url, params, json, headers)
+        response.raise_for_status()
+        return response
+
+    async def _fetch(self, name, method, url, params, json, headers):
+        if self.coalescer is not None and method == 'GET':
+            key = (name, url, tuple(sorted((params or {}).items())), headers.get('Authorization'))
+            return await self.coalescer.do(key, lambda: self._send(name, method, url, params=params, json=json, headers=headers))
+        return await self._send(name, method, url, params=params, json=json, headers=headers)
+
+    async def _reauthenticate(self, rejected):
+        """
+        Venmo._reauthenticate counterpart, concurrent tasks wait for the first one's login instead of threads
+        """
+        if self._reauthenticating is asyncio.current_task():
+            return False
+        async with self._auth_lock:
+            if self._authorization() != rejected:
+                return self.access_token is not None
+            if self._password is None:
+                return False
+            self._reauthenticating = asyncio.current_task()
+            try:
+                self.reauthentications += 1
+                await self._authenticate(self._login_username, self._password)
+            finally:
+                self._reauthenticating = None
+            return True
+
+    @staticmethod
+    def _endpoint_method(name):
+        signature, bind = endpoint_binder(name)
+
+        async def method(self, *args, **kwargs):
+            return self._decode(name, await self._call(name, **bind(self, args, kwargs)))
+        return named(method, name, signature)
+
+    async def _page(self, name, params=None, url=None, **path_params):
+        return self._decode(name, await self._call(name, params=params, url=url, **path_params))
+
+    async def _paginate(self, name, params=None, model=None, fields=None, **path_params):
+        build = None if model is None else model.builder(fields)
+        upcoming = None
+        try:
+            page = await self._page(name, params=params, **path_params)
+            while True:
+                next_url = next_page_url(page)
+                upcoming = asyncio.ensure_future(self._page(name, url=next_url)) if next_url else None
+                for item in page['data'] if page.get('data') else ():
+                    yield item if build is None else build(item)
+                if upcoming is None:
+                    return
+                page = await upcoming
+        finally:
+            if upcoming is not None and not upcoming.done():
+                upcoming.cancel()
+
+    async def login(self, username, password, reauthenticate=True):
+        """
+        :param reauthenticate: bool - keep the password in memory to log in again once the token is rejected or expiring
+        """
+        self._login_username = username
+        self._password = password if reauthenticate else None
+        if self.http2 and self._warm_up_task is None:
+            # Connect to the API host while logging in on venmo.com
+            self._warm_up_task = asyncio.ensure_future(self._warm_up(self.base_urls['api.venmo.com']))
+        await self._authenticate(username, password)
+
+    async def _warm_up(self, url):
+        try:
+            client = await self._client()
+            await client.head(url)
+        except Exception:
+            # Only a head start, the real request reports any error
+            pass
+
+    async def _authenticate(self, username, password):
+        method, url, headers = self._endpoint('login')
+        response = await self._request('POST', url, json=self._login_payload(username, password), headers=headers)
+        if response.status_code == 401:
+            await self.two_factor_auth(response.headers['Venmo-Otp-Secret'], csrftoken_from(response))
+        self._set_login(response.json())
+        await self.get_me()
+
+    async def two_factor_auth(self, otp_secret, csrftoken):
+        response = await self._request('GET', 'https://venmo.com/two-factor', headers=two_factor_page_headers(self.device_id, otp_secret))
+        response.raise_for_status()
+
+        response = await self._request('GET', 'https://venmo.com/api/v5/two_factor/token', headers=two_factor_token_headers(otp_secret))
+        response.raise_for_status()
+
+        headers = two_factor_sms_headers(otp_secret)
+        response = await self._request('POST', 'https://venmo.com/api/v5/two_factor/token', json={"csrftoken2": csrftoken, "via": "sms"}, headers=headers)
+        response.raise_for_status()
+
+        # Don't block the event loop while waiting on the sms code
+        headers['venmo-otp'] = await asyncio.get_running_loop().run_in_executor(None, input, 'SMS code received: ')
+        response = await self._request('POST', 'https://venmo.com/login', json={"csrftoken2": csrftoken}, headers=headers)
+        response.raise_for_status()
+
+    async def get_me(self):
+        me = self._decode('get_me', await self._call('get_me'))
+        self.external_id = me['external_id']
+        return me
+
+    async def charge(self, user_id, amount, note, audience='private'):
+        return self._decode('charge', await self._call('charge', json=self._charge_payload(user_id, amount, note, audience)))
+
+    async def sign_out(self):
+        return (await self._call('sign_out')).json()
+
+    def iter_stories(self, limit=None, model=None, fields=None):
+        params = None if limit is None else {'limit': limit}
+        return self._paginate('get_stories', params=params, model=model, fields=fields)
+
+    def iter_payments(self, action='pay', status='pending,held', limit=20, model=None, fields=None):
+        params = self._payments_params(action, status, limit)
+        return self._paginate('get_incomplete_payments', params=params, model=model, fields=fields)
+
+    def iter_authorizations(self, limit=20, model=None, fields=None):
+        params = dict(ENDPOINTS['get_authorizations'].params, limit=limit)
+        return self._paginate('get_authorizations', params=params, model=model, fields=fields)
+
+    def iter_friends(self, limit=1337, model=None, fields=None):
+        return self._paginate('get_friends', params={'limit': limit}, model=model, fields=fields)
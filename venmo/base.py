@@ -0,0 +1,133 @@
+import time
+from urllib.parse import urlsplit
+
+from .endpoints import BASE_URLS, ENDPOINTS, PathParams, api_headers, decode
+from .instrumentation import RequestEvent
+
+
+class VenmoBase:
+    """
+    Account state and request building shared by the sync and asyncio clients
+    """
+    def __init__(self):
+        self.username = None
+        self.phone_number = None
+        self.name = None
+        self.access_token = None
+        self.balance = None
+        self.id = None
+        self.email = None
+        self.external_id = None
+        self.device_id = 'EFF75587-5CB7-432B-BB59-639820DFD2DD'
+        self.token_expires_at = None
+        self.token_ttl = None
+        self.reauthentications = 0
+        self.instrumentation = None
+        self.base_urls = dict(BASE_URLS)
+        self.http2 = False
+        self._headers = {}
+        self._login_username = None
+        self._password = None
+        self._unrenewable = None  # Authorization a proactive renewal already failed to replace
+
+    def _endpoint(self, name, url=None, **path_params):
+        """
+        :param url: str - absolute url to use instead of the path template eg. a pagination cursor
+        :return: tuple - (http method, url, headers) for the ENDPOINTS entry `name`
+        """
+        endpoint = ENDPOINTS[name]
+        host = endpoint.host
+        if url is None:
+            url = self.base_urls[host] + endpoint.path.format_map(PathParams(self, path_params))
+        else:
+            host = urlsplit(url).netloc
+        return endpoint.method, url, self._host_headers(host, None if name == 'login' else self.access_token)
+
+    def _decode(self, name, response):
+        if self.instrumentation is None:
+            return decode(name, response)
+        started = time.perf_counter()
+        body = decode(name, response)
+        self.instrumentation.record(RequestEvent(name, decode=time.perf_counter() - started))
+        return body
+
+    def _host_headers(self, host, access_token):
+        """
+        Headers are built once per host and token, callers must copy them before making changes
+        """
+        key = (host, access_token, self.device_id, self.http2)
+        headers = self._headers.get(key)
+        if headers is None:
+            if len(self._headers) > 8:
+                # Superseded tokens or device ids
+                self._headers.clear()
+            headers = self._headers[key] = api_headers(host, self.device_id, access_token)
+            if self.http2:
+                # Connection-specific headers are forbidden in HTTP/2
+                del headers['Connection']
+        return headers
+
+    SESSION_FIELDS = ('username', 'phone_number', 'name', 'access_token', 'balance', 'id', 'email', 'external_id', 'device_id',
+                      'token_expires_at')
+
+    # Seconds before token_expires_at a token is proactively replaced
+    REFRESH_MARGIN = 60
+
+    # Calls a rejected token isn't renewed for
+    NO_REAUTHENTICATION = ('sign_out',)
+
+    def session_state(self):
+        """
+        :return: dict - everything login and get_me set, enough to resume the session elsewhere
+        """
+        return {field: getattr(self, field) for field in self.SESSION_FIELDS}
+
+    def restore_session(self, state):
+        for field in self.SESSION_FIELDS:
+            setattr(self, field, state.get(field))
+
+    def _login_payload(self, username, password):
+        return {
+            "client_id": "1",
+            "password": password,
+            "phone_email_or_username": username
+        }
+
+    def _set_login(self, data):
+        self.username = data['username']
+        self.phone_number = data['phone']
+        self.name = data['name']
+        self.access_token = data['access_token']
+        self.balance = data['balance']
+        self.id = data['id']
+        self.email = data['email']
+        expires_in = data.get('expires_in') or self.token_ttl
+        self.token_expires_at = None if expires_in is None else time.time() + float(expires_in)
+
+    def _authorization(self):
+        return None if self.access_token is None else f'Bearer {self.access_token}'
+
+    def _token_expiring(self):
+        """
+        True once the token is within REFRESH_MARGIN of expiring, unless renewing it ahead of time already failed
+        - then only a 401 tries again, instead of every call
+        """
+        return (self.token_expires_at is not None and time.time() >= self.token_expires_at - self.REFRESH_MARGIN
+                and self._authorization() != self._unrenewable)
+
+    def _payments_params(self, action, status='pending,held', limit='20'):
+        return {
+            'action': action,
+            'actor':  self.external_id,
+            'limit':  limit,
+            'status': status
+        }
+
+    def _charge_payload(self, user_id, amount, note, audience='private'):
+        # Requests share the payments endpoint, told apart by a negative amount
+        return {
+            'user_id':  user_id,
+            'amount':   -amount,
+            'note':     note,
+            'audience': audience
+        }
@@ -0,0 +1,211 @@
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+import requests
+from collections import Counter, namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from .governor import is_connect_error
+
+
+PaymentInstruction = namedtuple('PaymentInstruction', ['action', 'user_id', 'amount', 'note', 'audience', 'key'],
+                                defaults=('private', None))
+PaymentInstruction.__doc__ = """
+One payment or request for Venmo.submit_payments
+
+:param action: str - 'pay' or 'charge'
+:param amount: float - dollars, positive for both actions
+:param key: str - idempotency key, derived from the instruction and its position among identical ones when None
+"""
+
+PaymentResult = namedtuple('PaymentResult', ['instruction', 'key', 'status', 'response', 'error'])
+PaymentResult.__doc__ = """
+:param status: str - 'sent', 'already_sent' by an earlier run, 'failed' and safe to resubmit, or 'unknown' when the
+               request may have reached Venmo - it is never resent automatically, check the account and settle it
+               with PaymentJournal.resolve
+:param response: dict - decoded Venmo response when sent
+:param error: Exception or str - why it failed, None otherwise
+"""
+
+
+class PaymentJournal:
+    """
+    sqlite record of every submitted idempotency key, so a rerun after a crash skips what was already sent
+
+    A key is claimed ('in_flight') before its request goes out and marked 'sent' or 'failed' once the outcome is known,
+    keys left in flight by a crash are reported 'unknown' instead of being sent twice
+    """
+    def __init__(self, path):
+        self.path = path
+        self._db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._db:
+            self._db.execute('PRAGMA journal_mode=WAL')
+            self._db.execute('CREATE TABLE IF NOT EXISTS payments (key TEXT PRIMARY KEY, account TEXT NOT NULL, '
+                             'action TEXT NOT NULL, user_id TEXT NOT NULL, amount REAL NOT NULL, note TEXT, '
+                             'state TEXT NOT NULL, response TEXT, error TEXT, updated_at REAL NOT NULL)')
+
+    def close(self):
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def claim(self, key, account, instruction):
+        """
+        :return: tuple - (state, response, error) recorded for `key` when it can't be sent, None once claimed
+        """
+        with self._lock, self._db:
+            claimed = self._db.execute(
+                "INSERT OR IGNORE INTO payments VALUES (?, ?, ?, ?, ?, ?, 'in_flight', NULL, NULL, ?)",
+                (key, account, instruction.action, str(instruction.user_id), instruction.amount, instruction.note,
+                 time.time())).rowcount
+            if not claimed:
+                # Definite failures never reached Venmo or were rejected by it, they are retried
+                claimed = self._db.execute("UPDATE payments SET state = 'in_flight', error = NULL, updated_at = ? "
+                                           "WHERE key = ? AND state = 'failed'", (time.time(), key)).rowcount
+            if claimed:
+                return None
+            state, response, error = self._db.execute('SELECT state, response, error FROM payments WHERE key = ?',
+                                                      (key,)).fetchone()
+        return state, None if response is None else json.loads(response), error
+
+    def resolve(self, key, state, response=None, error=None):
+        """
+        :param state: str - 'sent' or 'failed'
+        """
+        with self._lock, self._db:
+            self._db.execute('UPDATE payments SET state = ?, response = ?, error = ?, updated_at = ? WHERE key = ?',
+                             (state, None if response is None else json.dumps(response), error, time.time(), key))
+
+    def unresolved(self, account=None):
+        """
+        :return: list - (key, action, user_id, amount, note) of requests whose outcome is unknown
+        """
+        query = "SELECT key, action, user_id, amount, note FROM payments WHERE state = 'in_flight'"
+        with self._lock:
+            if account is None:
+                return self._db.execute(query).fetchall()
+            return self._db.execute(query + ' AND account = ?', (account,)).fetchall()
+
+
+def idempotency_key(account, instruction, occurrence):
+    """
+    Stable across runs over the same input, identical instructions are told apart by their `occurrence`
+    """
+    identity = [account, instruction.action, str(instruction.user_id), str(instruction.amount), instruction.note,
+                instruction.audience, occurrence]
+    return hashlib.sha256(json.dumps(identity).encode()).hexdigest()[:32]
+
+
+def is_blank(value):
+    return value is None or isinstance(value, str) and not value.strip()
+
+
+def as_instruction(value):
+    """
+    :param value: PaymentInstruction, dict or tuple - eg. a csv.DictReader row, whose amount is a string and
+                  whose columns beyond PaymentInstruction's fields are ignored
+    """
+    if isinstance(value, PaymentInstruction):
+        return value
+    if isinstance(value, dict):
+        instruction = PaymentInstruction(**{field: value[field] for field in PaymentInstruction._fields if field in value})
+    else:
+        instruction = PaymentInstruction(*value)
+    # Blank cells take the field's default, an empty key would be shared by every row leaving it blank
+    instruction = instruction._replace(key=None if is_blank(instruction.key) else instruction.key,
+                                       audience='private' if is_blank(instruction.audience) else instruction.audience)
+    try:
+        return instruction._replace(amount=float(instruction.amount))
+    except (TypeError, ValueError):
+        # Left as is, submit_one reports it as failed
+        return instruction
+
+
+def submit_payments(venmo, instructions, journal=None, max_workers=4, rate_limiter=None):
+    """
+    :return: generator - PaymentResult per instruction in order of completion, at most 2 * max_workers instructions
+             are read ahead of the results consumed
+    """
+    account = str(venmo.id)
+    occurrences = Counter()
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='venmo-bulk')
+    running = set()
+    try:
+        for instruction in instructions:
+            instruction = as_instruction(instruction)
+            key = instruction.key
+            if key is None:
+                identity = (instruction.action, str(instruction.user_id), instruction.amount, instruction.note, instruction.audience)
+                key = idempotency_key(account, instruction, occurrences[identity])
+                occurrences[identity] += 1
+            running.add(executor.submit(submit_one, venmo, account, instruction, key, journal, rate_limiter))
+            if len(running) >= 2 * max_workers:
+                done, running = wait(running, return_when=FIRST_COMPLETED)
+                yield from (future.result() for future in done)
+        while running:
+            done, running = wait(running, return_when=FIRST_COMPLETED)
+            yield from (future.result() for future in done)
+    finally:
+        for future in running:
+            future.cancel()
+        # Requests already sent still get their outcome journaled
+        executor.shutdown(wait=True)
+
+
+def submit_one(venmo, account, instruction, key, journal=None, rate_limiter=None):
+    """
+    Never raises, every outcome including invalid instructions and journal errors comes back as a PaymentResult
+    """
+    try:
+        if instruction.action not in ('pay', 'charge'):
+            return PaymentResult(instruction, key, 'failed', None, f'Unknown action {instruction.action!r}')
+        if not isinstance(instruction.amount, (int, float)) or not instruction.amount > 0:
+            return PaymentResult(instruction, key, 'failed', None, f'Amount must be a positive number, got {instruction.amount!r}')
+        if journal is not None:
+            recorded = journal.claim(key, account, instruction)
+            if recorded is not None:
+                state, response, error = recorded
+                return PaymentResult(instruction, key, 'already_sent' if state == 'sent' else 'unknown', response, error)
+        if rate_limiter is not None:
+            rate_limiter.acquire()
+    except Exception as e:
+        # Nothing was sent, a claim made above is released for the next run to retry
+        if journal is not None:
+            try:
+                journal.resolve(key, 'failed', error=repr(e))
+            except Exception:
+                pass
+        return PaymentResult(instruction, key, 'failed', None, e)
+    send = venmo.pay if instruction.action == 'pay' else venmo.charge
+    try:
+        response = send(instruction.user_id, instruction.amount, instruction.note, instruction.audience)
+    except Exception as e:
+        status = e.response.status_code if isinstance(e, requests.HTTPError) else None
+        # Rejected by Venmo or never connected is definite, anything else may have been acted on
+        definite = (status is not None and status < 500) or is_connect_error(e)
+        return finish(journal, PaymentResult(instruction, key, 'failed' if definite else 'unknown', None, e))
+    return finish(journal, PaymentResult(instruction, key, 'sent', response, None))
+
+
+def finish(journal, result):
+    """
+    Journal the outcome of a sent request, a journal failure leaves the key in flight and the result 'unknown'
+    so it is never sent again
+    """
+    if journal is None or result.status == 'unknown':
+        return result
+    try:
+        if result.status == 'sent':
+            journal.resolve(result.key, 'sent', result.response)
+        else:
+            journal.resolve(result.key, 'failed', error=repr(result.error))
+    except Exception as e:
+        return result._replace(status='unknown', error=e)
+    return result
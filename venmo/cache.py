@@ -0,0 +1,85 @@
+import time
+import threading
+from collections import OrderedDict
+
+
+# Default seconds a response stays fresh once Venmo.enable_cache is called
+CACHE_TTLS = {
+    'get_me':                  300,
+    'get_account':             60,
+    'get_payment_methods':     300,
+    'get_back_accounts':       300,
+    'get_blocked_users':       300,
+    'get_hermes_whitelist':    3600,
+    'get_remembered_devices':  300,
+}
+
+# Mutating endpoint: cached endpoints whose responses it makes stale
+CACHE_INVALIDATES = {
+    'change_password':  ('get_me', 'get_account'),
+    'change_number':    ('get_me', 'get_account'),
+    'edit_profile':     ('get_me', 'get_account'),
+    'forget_device':    ('get_remembered_devices',),
+    'pay':              ('get_account',),
+    'charge':           ('get_account',),
+    'sign_out':         tuple(CACHE_TTLS),
+}
+
+
+class TTLCache:
+    """
+    Thread safe LRU mapping whose entries go stale `ttl` seconds after being set
+
+    Stale entries are kept around (until evicted) so callers can revalidate them with `peek`
+    """
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()  # key: (expires_at, value)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def peek(self, key, default=None):
+        """
+        :return: cached value for `key` whether or not it is stale, without touching the counters
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            return default if entry is None else entry[1]
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def discard(self, predicate):
+        """
+        :param predicate: callable - drop every entry whose key it returns True for
+        """
+        with self._lock:
+            for key in [key for key in self._entries if predicate(key)]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions, 'size': len(self._entries)}
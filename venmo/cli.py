@@ -0,0 +1,66 @@
+import os
+import argparse
+import configparser
+
+
+def load_config(path):
+    cfg = configparser.ConfigParser()
+    if not cfg.read(path):
+        raise SystemExit(f'{path} not found - copy config.cfg.example to it and fill in your login')
+    return cfg
+
+
+def logged_in(cfg):
+    from .client import Venmo
+    venmo = Venmo()
+    venmo.login(cfg.get('login', 'username'), cfg.get('login', 'password'))
+    return venmo
+
+
+def friends(args, cfg):
+    print(logged_in(cfg).get_friends())
+
+
+def export_history(args, cfg):
+    from .export import accounts_from_config, export_accounts
+    accounts = accounts_from_config(cfg)
+    unknown = set(args.accounts) - set(accounts)
+    if unknown:
+        raise SystemExit(f'No [login:<name>] section for {", ".join(sorted(unknown))} in {args.config}')
+    if args.accounts:
+        accounts = {name: accounts[name] for name in args.accounts}
+    failed = False
+    for result in export_accounts(accounts, args.output, args.resource, args.format, args.workers,
+                                  chunk_size=args.chunk_size, resume=not args.restart):
+        if result.error is None:
+            print(f'{result.account}: {result.rows} {args.resource} written to {result.path}')
+        else:
+            failed = True
+            print(f'{result.account}: export failed, run again to resume - {result.error!r}')
+    if failed:
+        raise SystemExit(1)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='venmo', description='Venmo API client')
+    parser.add_argument('--config', default=os.path.join(os.getcwd(), 'config.cfg'),
+                        help='config file with a [login] section and optionally [login:<name>] ones, ./config.cfg by default')
+    commands = parser.add_subparsers(dest='command')
+    commands.add_parser('friends', help='log in and print your friends (default)').set_defaults(run=friends)
+    export = commands.add_parser('export', help='stream account history to files, resuming interrupted exports')
+    export.add_argument('accounts', nargs='*', help='[login:<name>] sections to export, every account when omitted')
+    export.add_argument('--resource', default='stories', choices=('stories', 'payments', 'requests', 'friends'))
+    export.add_argument('--format', default='ndjson', choices=('ndjson', 'csv', 'parquet'),
+                        help='parquet requires pyarrow')
+    export.add_argument('--output', default='export', help='directory written to, ./export by default')
+    export.add_argument('--workers', type=int, default=4, help='accounts exported at once')
+    export.add_argument('--chunk-size', type=int, default=5000, help='items held in memory between writes')
+    export.add_argument('--restart', action='store_true', help='ignore checkpoints of earlier runs')
+    export.set_defaults(run=export_history)
+    args = parser.parse_args(argv)
+    args.run = getattr(args, 'run', friends)
+    args.run(args, load_config(args.config))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,395 @@
+import time
+import threading
+import requests
+from concurrent.futures import ThreadPoolExecutor
+
+from .base import VenmoBase
+from .cache import CACHE_TTLS, CACHE_INVALIDATES, TTLCache
+from .coalesce import SingleFlight
+from .endpoints import (ENDPOINTS, csrftoken_from, endpoint_binder, endpoint_methods, named, next_page_url,
+                        two_factor_page_headers, two_factor_sms_headers, two_factor_token_headers)
+from .governor import GovernedSession
+from .instrumentation import RequestEvent
+from .jsonstream import ArrayStream
+from .resolve import UserResolver
+
+# Bytes read at a time when streaming a listing
+STREAM_CHUNK_SIZE = 1 << 16
+
+
+@endpoint_methods
+class Venmo(VenmoBase):
+    def __init__(self, session=None, token_store=None, retry=None, rate_limiter=None, instrumentation=None, token_ttl=None,
+                 transport=None, http2=False, coalesce=True):
+        """
+        :param session: requests.Session - eg. one sharing its connection pool with other accounts,
+                        a new GovernedSession using `retry` and `rate_limiter` when None
+        :param token_store: TokenStore - reuse the session persisted by an earlier login instead of logging in again
+        :param retry: RetryPolicy - RetryPolicy() defaults when None
+        :param rate_limiter: RateLimiter - eg. one shared with other accounts, unlimited when None
+        :param instrumentation: Instrumentation - receives a RequestEvent per request and body decode, off when None
+        :param token_ttl: float - seconds an access token lasts when the login response doesn't say, tokens are then
+                          renewed REFRESH_MARGIN seconds before expiring instead of after being rejected
+        :param transport: requests adapter - mounted for every url of the session eg. transport.ReplayAdapter('x.cassette')
+                          to run without a network
+        :param http2: bool - send through a transport.HTTP2Adapter unless `transport` is given, multiplexing concurrent
+                      calls over one connection per host shared by every account in the process, requires httpx[http2]
+        :param coalesce: bool - identical GETs issued while one is in flight share its response instead of being sent again
+        """
+        super().__init__()
+        self.instrumentation = instrumentation
+        self.session = GovernedSession(retry, rate_limiter) if session is None else session
+        self.http2 = http2
+        if http2 and transport is None:
+            from .transport import HTTP2Adapter
+            transport = HTTP2Adapter()
+        if transport is not None:
+            self.session.mount('https://', transport)
+            self.session.mount('http://', transport)
+        self.token_store = token_store
+        self.token_ttl = token_ttl
+        self.cache = None
+        self.cache_ttls = {}
+        self.revalidations = 0
+        self.resolver = UserResolver(self)
+        self.coalescer = SingleFlight() if coalesce else None
+        self._auth_lock = threading.Lock()
+        self._reauthenticating = None
+
+    def enable_cache(self, ttls=None, maxsize=256):
+        """
+        Serve repeated reads of rarely changing endpoints from memory
+
+        :param ttls: dict - endpoint name: seconds fresh, merged over CACHE_TTLS - 0 disables caching an endpoint
+        :param maxsize: int - most responses kept before least recently used ones are evicted
+        """
+        self.cache_ttls = dict(CACHE_TTLS, **(ttls or {}))
+        self.cache = TTLCache(maxsize)
+
+    def cache_stats(self):
+        if self.cache is None:
+            return None
+        return dict(self.cache.stats(), revalidations=self.revalidations)
+
+    def _call(self, name, params=None, json=None, url=None, stream=False, **path_params):
+        """
+        :param stream: bool - leave the body unread for iter_content, bypasses the cache
+        """
+        if self._token_expiring():
+            authorization = self._authorization()
+            if not self._reauthenticate(authorization):
+                self._unrenewable = authorization
+        try:
+            return self._authorized_call(name, params, json, url, stream, path_params)
+        except requests.HTTPError as e:
+            if (e.response.status_code != 401 or name in self.NO_REAUTHENTICATION
+                    or not self._reauthenticate(e.response.request.headers.get('Authorization'))):
+                raise
+        return self._authorized_call(name, params, json, url, stream, path_params)
+
+    def _authorized_call(self, name, params, json, url, stream, path_params):
+        method, url, headers = self._endpoint(name, url=url, **path_params)
+        if self.coalescer is not None and method == 'GET' and not stream:
+            key = (name, url, tuple(sorted((params or {}).items())), headers.get('Authorization'))
+            return self.coalescer.do(key, lambda: self._fetch(name, method, url, params, json, headers, stream))
+        return self._fetch(name, method, url, params, json, headers, stream)
+
+    def _fetch(self, name, method, url, params, json, headers, stream):
+        if not stream and self.cache is not None and self.cache_ttls.get(name):
+            return self._cached_call(name, url, params, headers)
+        try:
+            response = self._send(name, method, url, params=params, json=json, headers=headers, stream=stream)
+        finally:
+            if self.cache is not None and name in CACHE_INVALIDATES:
+                stale = CACHE_INVALIDATES[name]
+                self.cache.discard(lambda key: key[0] in stale)
+        response.raise_for_status()
+        return response
+
+    def _send(self, name, method, url, **kwargs):
+        if self.instrumentation is None:
+            return self.session.request(method, url, **kwargs)
+        started = time.perf_counter()
+        try:
+            response = self.session.request(method, url, **kwargs)
+        except Exception as e:
+            self.instrumentation.record(RequestEvent(name, method, error=type(e).__name__, total=time.perf_counter() - started))
+            raise
+        # requests doesn't expose connection setup, elapsed runs from sending until the response headers were parsed
+        size = None if kwargs.get('stream') else len(response.content)
+        self.instrumentation.record(RequestEvent(name, method, response.status_code, size,
+                                                 ttfb=response.elapsed.total_seconds(), total=time.perf_counter() - started))
+        return response
+
+    def _cached_call(self, name, url, params, headers):
+        key = (name, url, tuple(sorted((params or {}).items())))
+        response = self.cache.get(key)
+        if response is not None:
+            return response
+        cached = self.cache.peek(key)
+        if cached is not None:
+            # Stale - let the server answer 304 instead of resending the body when it supports validators
+            headers = dict(headers)
+            if 'ETag' in cached.headers:
+                headers['If-None-Match'] = cached.headers['ETag']
+            if 'Last-Modified' in cached.headers:
+                headers['If-Modified-Since'] = cached.headers['Last-Modified']
+        response = self._send(name, 'GET', url, params=params, headers=headers)
+        if response.status_code == 304 and cached is not None:
+            self.revalidations += 1
+            response = cached
+        else:
+            response.raise_for_status()
+        self.cache.set(key, response, self.cache_ttls[name])
+        return response
+
+    @staticmethod
+    def _endpoint_method(name):
+        signature, bind = endpoint_binder(name)
+
+        def method(self, *args, **kwargs):
+            return self._decode(name, self._call(name, **bind(self, args, kwargs)))
+        return named(method, name, signature)
+
+    def _page(self, name, params=None, url=None, **path_params):
+        return self._decode(name, self._call(name, params=params, url=url, **path_params))
+
+    def _paginate(self, name, params=None, model=None, fields=None, stream=False, **path_params):
+        """
+        :param model: Model - class to build the items as instead of handing out dicts
+        :param fields: iterable - model attributes to materialize, all when None
+        :param stream: bool - parse each page incrementally while it downloads, holding one item at a time
+                       instead of a decoded page, pages are then fetched one after the other
+        """
+        if stream:
+            items = self._streamed_items(name, params, path_params)
+        else:
+            items = self._prefetched_items(name, params, path_params)
+        return items if model is None else map(model.builder(fields), items)
+
+    def _streamed_items(self, name, params, path_params):
+        url = None
+        while True:
+            with self._call(name, params=params, url=url, stream=True, **path_params) as response:
+                page = ArrayStream(response.iter_content(STREAM_CHUNK_SIZE))
+                count = 0
+                for item in page:
+                    count += 1
+                    yield item
+            url = next_page_url(dict(page.rest, data=count))
+            if url is None:
+                return
+            params = None
+
+    def _prefetched_items(self, name, params, path_params):
+        """
+        Yield the `data` items of every page of a listing endpoint, fetching the page after the
+        current one in a background thread while the caller consumes it
+        """
+        prefetcher = ThreadPoolExecutor(max_workers=1)
+        upcoming = None
+        try:
+            page = self._page(name, params=params, **path_params)
+            while True:
+                next_url = next_page_url(page)
+                upcoming = prefetcher.submit(self._page, name, url=next_url) if next_url else None
+                yield from page['data'] if page.get('data') else ()
+                if upcoming is None:
+                    return
+                page = upcoming.result()
+        finally:
+            if upcoming is not None:
+                upcoming.cancel()
+            prefetcher.shutdown(wait=False)
+
+    def login(self, username, password, validate=True, reauthenticate=True):
+        """
+        :param validate: bool - with a token store, check a stored token with get_me before trusting it
+        :param reauthenticate: bool - keep the password in memory to log in again once the token is rejected or expiring,
+                               otherwise only a newer token saved to the token store by another process is picked up
+        """
+        self._login_username = username
+        self._password = password if reauthenticate else None
+        self._warm_up()
+        if self.token_store is not None and self._resume(username, validate):
+            return
+        self._authenticate(username, password)
+
+    def _authenticate(self, username, password):
+        method, url, headers = self._endpoint('login')
+        # TODO handle new devices and 2fa - Venmo-Otp-Secret in response headers
+        response = self.session.post(url, json=self._login_payload(username, password), headers=headers)
+        if response.status_code == 401:
+            self.two_factor_auth(response.headers['Venmo-Otp-Secret'], csrftoken_from(response))
+        # TODO need to class variable declarations if 2fa needed - 'response'
+        self._set_login(response.json())
+        if self.cache is not None:
+            self.cache.clear()
+        # Call method to set external id
+        self.get_me()
+        if self.token_store is not None:
+            self.token_store.save(username, self.session_state())
+
+    def _warm_up(self):
+        """
+        Let transports that can, eg. HTTP2Adapter, connect to every API host while login is in flight
+        """
+        for base_url in set(self.base_urls.values()):
+            adapter = self.session.get_adapter(base_url)
+            if hasattr(adapter, 'warm_up'):
+                adapter.warm_up(base_url)
+
+    def _reauthenticate(self, rejected):
+        """
+        Single flight renewal of the access token, the first thread whose token was rejected (or is expiring) logs in
+        again while the others block on the lock and then reuse its token
+
+        :param rejected: str - Authorization header value the server turned down
+        :return: bool - True when a different token is available to replay the request with
+        """
+        if self._reauthenticating == threading.get_ident():
+            # The renewal's own requests failed
+            return False
+        with self._auth_lock:
+            if self._authorization() != rejected:
+                return self.access_token is not None
+            self._reauthenticating = threading.get_ident()
+            try:
+                return self._renew_token(rejected)
+            finally:
+                self._reauthenticating = None
+
+    def _renew_token(self, rejected):
+        if self.token_store is not None and self._login_username is not None:
+            state = self.token_store.load(self._login_username)
+            if state is not None and state.get('access_token') and f'Bearer {state["access_token"]}' != rejected:
+                self.restore_session(state)
+                return True
+        if self._password is None:
+            return False
+        self.reauthentications += 1
+        self._authenticate(self._login_username, self._password)
+        return True
+
+    def _resume(self, username, validate):
+        state = self.token_store.load(username)
+        if state is None:
+            return False
+        self.restore_session(state)
+        if self.cache is not None:
+            self.cache.clear()
+        if not validate:
+            return True
+        try:
+            self.get_me()
+        except requests.HTTPError as e:
+            if e.response.status_code != 401:
+                raise
+            self.token_store.delete(username)
+            self.access_token = None
+            return False
+        return True
+
+    def two_factor_auth(self, otp_secret, csrftoken):
+        # TODO I'm in Canada will flesh this out when I'm back state-side
+        # Need to go here first otherwise api call results in 400 Client error
+        response = self.session.get('https://venmo.com/two-factor', headers=two_factor_page_headers(self.device_id, otp_secret))
+        response.raise_for_status()
+
+        response = self.session.get('https://venmo.com/api/v5/two_factor/token', headers=two_factor_token_headers(otp_secret))
+        response.raise_for_status()
+        response.json()  # braintree stuff and security
+
+        # send sms
+        headers = two_factor_sms_headers(otp_secret)
+        payload = {
+            "csrftoken2": csrftoken,  # should get from the set-cookie in the response headers
+            "via": "sms"
+        }
+        response = self.session.post('https://venmo.com/api/v5/two_factor/token', json=payload, headers=headers)
+        response.raise_for_status()  # response['data']['status'] == 'sent'
+
+        # Require manual input for sms - integrate automation with google voice maybe if venmo short code supported?
+        sms_code_received = input('SMS code received: ')
+        headers['venmo-otp'] = sms_code_received
+        payload = {
+            "csrftoken2": csrftoken,  # should get from the set-cookie in the response headers
+        }
+        response = self.session.post('https://venmo.com/login', json=payload, headers=headers)
+        response.raise_for_status()
+
+    def get_me(self):
+        me = self._decode('get_me', self._call('get_me'))
+        self.external_id = me['external_id']
+        return me
+
+    def charge(self, user_id, amount, note, audience='private'):
+        """
+        Request `amount` dollars from user_id
+        """
+        return self._decode('charge', self._call('charge', json=self._charge_payload(user_id, amount, note, audience)))
+
+    def resolve_users(self, queries, max_workers=8, friends=True, model=None, fields=None):
+        """
+        Resolve usernames, emails, phone numbers or ids to users, each distinct query is searched at most once
+
+        :param queries: iterable - eg. a CSV column, duplicates and spelling variants like '@alice' / 'Alice' share a lookup
+        :param max_workers: int - most search_user calls in flight at once
+        :param friends: bool - match against the account's friends before searching
+        :param model: Model - eg. models.User to get compact objects instead of dicts
+        :return: dict - query: user, None when nobody matched the query exactly - raises ResolveError holding the
+                 resolved users as dicts and the errors once every lookup finished when some searches failed
+        """
+        resolved = self.resolver.resolve(queries, max_workers, friends)
+        if model is None:
+            return resolved
+        build = model.builder(fields)
+        return {query: None if user is None else build(user) for query, user in resolved.items()}
+
+    def submit_payments(self, instructions, journal=None, max_workers=4, rate_limiter=None):
+        """
+        Send many payments and requests concurrently, results stream back as they complete
+
+        for result in venmo.submit_payments(csv.DictReader(f), journal=PaymentJournal('payroll.db')):
+            ...
+
+        :param instructions: iterable - PaymentInstruction, dict or tuple per payment, consumed lazily
+        :param journal: PaymentJournal - rerunning the same instructions with the same journal after a crash
+                        sends only what wasn't sent before
+        :param max_workers: int - most requests in flight at once
+        :param rate_limiter: RateLimiter - pacing this account's submissions on top of the session's own limiter
+        :return: generator - PaymentResult per instruction
+        """
+        from .bulk import submit_payments
+        return submit_payments(self, instructions, journal, max_workers, rate_limiter)
+
+    def sign_out(self):
+        signed_out = self._call('sign_out').json()
+        if self.token_store is not None and self._login_username is not None:
+            self.token_store.delete(self._login_username)
+        return signed_out
+
+    def iter_stories(self, limit=None, model=None, fields=None, stream=False):
+        """
+        :param limit: int - page size, server default when None
+        :param model: Model - eg. models.Story to get compact objects instead of dicts
+        :param fields: iterable - model attributes to materialize, all when None
+        :param stream: bool - decode pages incrementally, see _paginate
+        """
+        params = None if limit is None else {'limit': limit}
+        return self._paginate('get_stories', params=params, model=model, fields=fields, stream=stream)
+
+    def iter_payments(self, action='pay', status='pending,held', limit=20, model=None, fields=None, stream=False):
+        """
+        :param action: str - 'pay' for payments or 'charge' for requests
+        :param status: str - comma separated payment statuses eg. 'pending,held' or 'settled'
+        """
+        params = self._payments_params(action, status, limit)
+        return self._paginate('get_incomplete_payments', params=params, model=model, fields=fields, stream=stream)
+
+    def iter_authorizations(self, limit=20, model=None, fields=None, stream=False):
+        params = dict(ENDPOINTS['get_authorizations'].params, limit=limit)
+        return self._paginate('get_authorizations', params=params, model=model, fields=fields, stream=stream)
+
+    def iter_friends(self, limit=1337, model=None, fields=None, stream=False):
+        return self._paginate('get_friends', params={'limit': limit}, model=model, fields=fields, stream=stream)
@@ -0,0 +1,81 @@
+import threading
+from concurrent.futures import Future
+
+
+class SingleFlight:
+    """
+    Collapses identical concurrent calls across threads, the first caller of a key runs it and
+    every caller arriving while it is in flight gets the same result or exception
+
+    Nothing is kept once the call returns, a later caller runs it again
+    """
+    def __init__(self):
+        self.calls = 0
+        self.shared = 0
+        self._flights = {}  # key: Future
+        self._lock = threading.Lock()
+
+    def do(self, key, fn):
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is None:
+                flight = self._flights[key] = Future()
+                self.calls += 1
+                leader = True
+            else:
+                self.shared += 1
+                leader = False
+        if not leader:
+            return flight.result()
+        try:
+            result = fn()
+        except BaseException as e:
+            self._land(key)
+            flight.set_exception(e)
+            raise
+        self._land(key)
+        flight.set_result(result)
+        return result
+
+    def _land(self, key):
+        with self._lock:
+            del self._flights[key]
+
+    def stats(self):
+        return {'calls': self.calls, 'shared': self.shared, 'in_flight': len(self._flights)}
+
+
+class AsyncSingleFlight:
+    """
+    SingleFlight for asyncio tasks on one event loop
+
+    The call runs in its own task so a caller being cancelled doesn't cancel it for the others
+    """
+    def __init__(self):
+        self.calls = 0
+        self.shared = 0
+        self._flights = {}  # key: asyncio.Task
+
+    async def do(self, key, factory):
+        """
+        :param factory: callable - returning the coroutine to run eg. lambda: client.get(url)
+        """
+        import asyncio
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = self._flights[key] = asyncio.ensure_future(factory())
+            flight.add_done_callback(lambda done: self._land(key, done))
+            self.calls += 1
+        else:
+            self.shared += 1
+        return await asyncio.shield(flight)
+
+    def _land(self, key, flight):
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        if not flight.cancelled():
+            # Retrieved so an exception nobody waits for anymore isn't logged as unhandled
+            flight.exception()
+
+    def stats(self):
+        return {'calls': self.calls, 'shared': self.shared, 'in_flight': len(self._flights)}
@@ -0,0 +1,218 @@
+import inspect
+from collections import namedtuple
+from operator import attrgetter
+
+from .jsonstream import loads
+
+
+USER_AGENT = 'Venmo/7.8.1 (iPhone; iOS 10.2; Scale/2.0)'
+
+# Endpoint host: scheme and authority requests are sent to, override per client with VenmoBase.base_urls
+BASE_URLS = {
+    'venmo.com':      'https://venmo.com',
+    'api.venmo.com':  'https://api.venmo.com',
+}
+
+Endpoint = namedtuple('Endpoint', ['method', 'host', 'path', 'params', 'json', 'args', 'response', 'doc'],
+                      defaults=(None, None, (), 'json', None))
+Endpoint.__doc__ = """
+Declarative description of one Venmo API call, Venmo and AsyncVenmo generate a method for every
+entry of ENDPOINTS they don't implement by hand
+
+:param path: str - template whose {fields} come from the method arguments or else the client's attributes
+:param params: dict - query string defaults, callable values are called with the client eg. attrgetter('external_id')
+:param json: dict - payload defaults
+:param args: tuple - method arguments in order, `name` or (`name`, `key`) when the param/payload/path key differs
+:param response: str - 'json' for the decoded body or 'content' for the raw bytes
+"""
+
+ENDPOINTS = {
+    'login':                    Endpoint('POST',   'venmo.com',     '/api/v5/oauth/access_token'),
+    'get_account':              Endpoint('GET',    'api.venmo.com', '/v1/account'),
+    'get_alerts':               Endpoint('GET',    'api.venmo.com', '/v1/alerts'),
+    'get_me':                   Endpoint('GET',    'venmo.com',     '/api/v5/users/me'),
+    'get_suggested':            Endpoint('GET',    'api.venmo.com', '/v1/suggested'),
+    'get_authorizations':       Endpoint('GET',    'api.venmo.com', '/v1/authorizations',
+                                         params={'acknowledged': 'False', 'status': 'active,captured', 'limit': 20},
+                                         args=('limit',)),
+    'get_stories':              Endpoint('GET',    'api.venmo.com', '/v1/stories/target-or-actor/friends'),
+    'get_merchant_views':       Endpoint('GET',    'api.venmo.com', '/v1/users/merchant-payments-activation-views'),
+    'get_hermes_whitelist':     Endpoint('GET',    'api.venmo.com', '/v1/hermes-whitelist', response='content'),
+    'search_user':              Endpoint('GET',    'api.venmo.com', '/v1/users', args=(('user', 'query'),)),
+    'get_back_accounts':        Endpoint('GET',    'venmo.com',     '/api/v5/bankaccounts'),
+    'get_payment_methods':      Endpoint('GET',    'api.venmo.com', '/v1/payment-methods'),
+    'get_incomplete_requests':  Endpoint('GET',    'api.venmo.com', '/v1/payments',
+                                         params={'action': 'charge', 'actor': attrgetter('external_id'), 'limit': '20', 'status': 'pending,held'}),
+    'get_incomplete_payments':  Endpoint('GET',    'api.venmo.com', '/v1/payments',
+                                         params={'action': 'pay', 'actor': attrgetter('external_id'), 'limit': '20', 'status': 'pending,held'}),
+    'pay':                      Endpoint('POST',   'api.venmo.com', '/v1/payments', json={'audience': 'private'},
+                                         args=('user_id', 'amount', 'note', 'audience'),
+                                         doc=':param user_id: str - id key of the user in eg. search_user results'),
+    'charge':                   Endpoint('POST',   'api.venmo.com', '/v1/payments', json={'audience': 'private'},
+                                         args=('user_id', 'amount', 'note', 'audience')),
+    'change_password':          Endpoint('PUT',    'api.venmo.com', '/v1/users/{external_id}',
+                                         args=('old_password', ('new_password', 'password'))),
+    'get_remembered_devices':   Endpoint('GET',    'venmo.com',     '/api/v5/devices'),
+    'forget_device':            Endpoint('DELETE', 'venmo.com',     '/api/v5/devices/{device_id}', args=('device_id',),
+                                         doc=':param device_id: int - user_device_id key in response of get_remembered_devices method for a given device'),
+    # TODO I'm in Canada will flesh this out when I'm back state-side
+    'change_number':            Endpoint('POST',   'venmo.com',     '/api/v5/phones', args=(('new_number', 'phone'),),
+                                         doc=':params new_number: str eg. "(123) 456-7890"'),
+    'get_blocked_users':        Endpoint('GET',    'api.venmo.com', '/v1/blocks'),
+    'make_all_past_transactions_private':
+                                Endpoint('POST',   'venmo.com',     '/api/v5/stories/each', json={'audience': 'private'}),
+    'make_all_past_transactions_viewable_by_friends':
+                                Endpoint('POST',   'venmo.com',     '/api/v5/stories/each', json={'audience': 'friends'}),
+    # TODO fetch currents so that we only pass through new/updated param to the payload
+    'edit_profile':             Endpoint('PUT',    'venmo.com',     '/api/v5/users/me',
+                                         json={'email': None, 'first_name': None, 'last_name': None, 'username': None},
+                                         args=('first_name', 'last_name', 'username', 'email')),
+    'get_friends':              Endpoint('GET',    'api.venmo.com', '/v1/users/{external_id}/friends', params={'limit': 1337},
+                                         args=('limit',)),
+    'sign_out':                 Endpoint('DELETE', 'venmo.com',     '/api/v5/oauth/access_token'),
+}
+
+
+def api_headers(host, device_id, access_token=None):
+    headers = {
+        'Host':             host,
+        'Connection':       'keep-alive',
+        'device-id':        device_id,
+        'Accept':           'application/json; charset=utf-8',
+        'User-Agent':       USER_AGENT,
+        'Accept-Language':  'en-US;q=1.0',
+        'Accept-Encoding':  'gzip;q=1.0,compress;q=0.5'
+    }
+    if access_token is None:
+        headers['Content-Type'] = 'application/json; charset=utf-8'
+    else:
+        headers['Authorization'] = f'Bearer {access_token}'
+    return headers
+
+
+def two_factor_page_headers(device_id, otp_secret):
+    return {
+        'Host':              'venmo.com',
+        'Accept-Encoding':   'gzip, deflate',
+        'Connection':        'keep-alive',
+        'device-id':         device_id,
+        'Accept':            'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+        'User-Agent':        USER_AGENT,
+        'Accept-Language':   'en-us',
+        'Referer':           'https://venmo.com/',
+        'Venmo-Otp-Secret':  otp_secret,
+        'Venmo-User-Agent':  USER_AGENT
+    }
+
+
+def two_factor_token_headers(otp_secret):
+    return {
+        'Host':              'venmo.com',
+        'Accept-Encoding':   'gzip, deflate',
+        'Connection':        'keep-alive',
+        'Accept':            'application/json',
+        'User-Agent':        USER_AGENT,
+        'Accept-Language':   'en-us',
+        'Referer':           'https://venmo.com/',
+        'venmo-otp-secret':  otp_secret
+    }
+
+
+def two_factor_sms_headers(otp_secret):
+    return {
+        'Host':              'venmo.com',
+        'Accept':            'application/json',
+        'Accept-Language':   'en-us',
+        'Accept-Encoding':   'gzip, deflate',
+        'Content-Type':      'application/json',
+        'Origin':            'https://venmo.com',
+        'User-Agent':        USER_AGENT,
+        'Connection':        'keep-alive',
+        'Referer':           'https://venmo.com/',
+        'venmo-otp-secret':  otp_secret
+    }
+
+
+def csrftoken_from(response):
+    return response.headers['Set-Cookie'].split('csrftoken2=')[-1].split(';')[0]
+
+
+def endpoint_binder(name):
+    """
+    :return: tuple - (inspect.Signature of the generated method, bind(client, args, kwargs) returning the _call keyword arguments)
+    """
+    endpoint = ENDPOINTS[name]
+    routes = []
+    parameters = [inspect.Parameter('self', inspect.Parameter.POSITIONAL_OR_KEYWORD)]
+    for arg in endpoint.args:
+        arg, key = (arg, arg) if isinstance(arg, str) else arg
+        if f'{{{key}}}' in endpoint.path:
+            target, default = 'path', inspect.Parameter.empty
+        elif endpoint.method == 'GET':
+            target, default = 'params', (endpoint.params or {}).get(key, inspect.Parameter.empty)
+        else:
+            target, default = 'json', (endpoint.json or {}).get(key, inspect.Parameter.empty)
+        routes.append((arg, key, target))
+        parameters.append(inspect.Parameter(arg, inspect.Parameter.POSITIONAL_OR_KEYWORD, default=default))
+    signature = inspect.Signature(parameters)
+
+    def bind(client, args, kwargs):
+        arguments = signature.bind(client, *args, **kwargs)
+        arguments.apply_defaults()
+        call = {
+            'params': None if endpoint.params is None else {
+                key: value(client) if callable(value) else value for key, value in endpoint.params.items()
+            },
+            'json': None if endpoint.json is None else dict(endpoint.json)
+        }
+        for arg, key, target in routes:
+            if target == 'path':
+                call[key] = arguments.arguments[arg]
+            else:
+                if call[target] is None:
+                    call[target] = {}
+                call[target][key] = arguments.arguments[arg]
+        return call
+    return signature, bind
+
+
+def decode(name, response):
+    return response.content if ENDPOINTS[name].response == 'content' else loads(response.content)
+
+
+def named(method, name, signature):
+    method.__name__ = method.__qualname__ = name
+    method.__signature__ = signature
+    method.__doc__ = ENDPOINTS[name].doc
+    return method
+
+
+def endpoint_methods(cls):
+    """
+    Class decorator adding cls._endpoint_method(name) for every ENDPOINTS entry `cls` doesn't define
+    """
+    for name in ENDPOINTS:
+        if not hasattr(cls, name):
+            setattr(cls, name, cls._endpoint_method(name))
+    return cls
+
+
+class PathParams(dict):
+    """
+    Path template fields, falling back to the client's attributes eg. {external_id}
+    """
+    def __init__(self, client, params):
+        super().__init__(params)
+        self.client = client
+
+    def __missing__(self, key):
+        return getattr(self.client, key)
+
+
+def next_page_url(page):
+    """
+    :return: str - cursor url of the page after `page` or None when `page` is the last one
+    """
+    if not page.get('data'):
+        return None
+    return (page.get('pagination') or {}).get('next')
@@ -0,0 +1,294 @@
+import os
+import csv
+import json
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from .endpoints import next_page_url
+from .jsonstream import dumps
+
+PAYMENT_COLUMNS = {
+    'id':               'id',
+    'action':           'action',
+    'status':           'status',
+    'amount':           'amount',
+    'note':             'note',
+    'audience':         'audience',
+    'date_created':     'date_created',
+    'date_completed':   'date_completed',
+    'actor_id':         'actor.id',
+    'actor_username':   'actor.username',
+    'target_id':        'target.user.id',
+    'target_username':  'target.user.username',
+}
+
+# Resource: flat column: dotted path into each listing item, for CSV and Parquet - NDJSON keeps the items whole
+COLUMNS = {
+    'stories': dict({
+        'story_id':      'id',
+        'story_type':    'type',
+        'date_updated':  'date_updated',
+    }, **{f'payment_{column}': f'payment.{path}' for column, path in PAYMENT_COLUMNS.items()}),
+    'payments': PAYMENT_COLUMNS,
+    'requests': PAYMENT_COLUMNS,
+    'friends': {
+        'id':            'id',
+        'username':      'username',
+        'display_name':  'display_name',
+        'first_name':    'first_name',
+        'last_name':     'last_name',
+        'is_active':     'is_active',
+        'date_joined':   'date_joined',
+    },
+}
+
+# Columns that aren't strings, for Parquet schemas
+COLUMN_TYPES = {
+    'amount':          'float64',
+    'payment_amount':  'float64',
+    'is_active':       'bool',
+}
+
+CONVERTERS = {'string': str, 'float64': float, 'bool': bool}
+
+# Resource: callable(venmo, page_size) returning the listing's (endpoint name, first page params)
+RESOURCES = {
+    'stories':   lambda venmo, limit: ('get_stories', {'limit': limit}),
+    'payments':  lambda venmo, limit: ('get_incomplete_payments', venmo._payments_params('pay', limit=limit)),
+    'requests':  lambda venmo, limit: ('get_incomplete_requests', venmo._payments_params('charge', limit=limit)),
+    'friends':   lambda venmo, limit: ('get_friends', {'limit': limit}),
+}
+
+FORMATS = {'.ndjson': 'ndjson', '.jsonl': 'ndjson', '.csv': 'csv', '.parquet': 'parquet'}
+
+ExportResult = namedtuple('ExportResult', ['account', 'path', 'rows', 'error'])
+
+
+def flatten(item, columns):
+    row = {}
+    for column, path in columns.items():
+        value = item
+        for key in path.split('.'):
+            value = value.get(key) if isinstance(value, dict) else None
+        row[column] = value
+    return row
+
+
+class NdjsonWriter:
+    """
+    One JSON document per line, items are written whole
+    """
+    extension = '.ndjson'
+
+    def __init__(self, path, columns, position=None):
+        self.file = open(path, 'r+b' if position else 'wb')
+        if position:
+            # Drop whatever was written after the checkpoint
+            self.file.truncate(position['offset'])
+            self.file.seek(position['offset'])
+
+    def write(self, items):
+        self.file.write(b''.join(dumps(item) + b'\n' for item in items))
+
+    def position(self):
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        return {'offset': self.file.tell()}
+
+    def close(self):
+        self.file.close()
+
+
+class CsvWriter(NdjsonWriter):
+    extension = '.csv'
+
+    def __init__(self, path, columns, position=None):
+        self.columns = columns
+        self.file = open(path, 'r+' if position else 'w', newline='', encoding='utf-8')
+        if position:
+            self.file.truncate(position['offset'])
+            self.file.seek(position['offset'])
+        self.csv = csv.DictWriter(self.file, fieldnames=list(columns))
+        if not position:
+            self.csv.writeheader()
+
+    def write(self, items):
+        self.csv.writerows(flatten(item, self.columns) for item in items)
+
+
+class ParquetWriter:
+    """
+    Directory of Parquet files, one per chunk, readable as one dataset eg. pyarrow.dataset.dataset(path) - requires pyarrow
+
+    Every file is renamed into place once complete so a crash never leaves a truncated one behind
+    """
+    extension = '.parquet'
+
+    def __init__(self, path, columns, position=None):
+        import pyarrow
+        import pyarrow.parquet
+        self.pyarrow = pyarrow
+        self.parquet = pyarrow.parquet
+        self.path = path
+        self.columns = columns
+        self.schema = pyarrow.schema([(column, COLUMN_TYPES.get(column, 'string')) for column in columns])
+        self.parts = position['parts'] if position else 0
+        os.makedirs(path, exist_ok=True)
+        for name in os.listdir(path):
+            if name.startswith('part-') and (not name.endswith('.parquet') or int(name[5:10]) >= self.parts):
+                os.remove(os.path.join(path, name))
+
+    def write(self, items):
+        rows = [flatten(item, self.columns) for item in items]
+        for row in rows:
+            for column, value in row.items():
+                if value is not None:
+                    row[column] = CONVERTERS[COLUMN_TYPES.get(column, 'string')](value)
+        table = self.pyarrow.Table.from_pylist(rows, schema=self.schema)
+        part = os.path.join(self.path, f'part-{self.parts:05d}.parquet')
+        self.parquet.write_table(table, f'{part}.tmp')
+        os.replace(f'{part}.tmp', part)
+        self.parts += 1
+
+    def position(self):
+        return {'parts': self.parts}
+
+    def close(self):
+        pass
+
+
+WRITERS = {
+    'ndjson':   NdjsonWriter,
+    'csv':      CsvWriter,
+    'parquet':  ParquetWriter,
+}
+
+
+class Checkpoint:
+    """
+    Progress of one export kept next to its output in `<path>.checkpoint` - the cursor of the next page
+    and how much of the output was written when that cursor was reached
+    """
+    def __init__(self, path):
+        self.path = f'{path}.checkpoint'
+
+    def load(self):
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def save(self, state):
+        with open(f'{self.path}.tmp', 'w') as f:
+            json.dump(state, f)
+        os.replace(f'{self.path}.tmp', self.path)
+
+    def clear(self):
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+def pages(venmo, name, params, url=None):
+    """
+    Yield (page, next page url) of a listing from its first page or `url`, fetching the next page in the background
+    """
+    with ThreadPoolExecutor(max_workers=1) as prefetcher:
+        page = venmo._page(name, params=None if url else params, url=url)
+        while True:
+            next_url = next_page_url(page)
+            upcoming = None if next_url is None else prefetcher.submit(venmo._page, name, url=next_url)
+            yield page, next_url
+            if upcoming is None:
+                return
+            page = upcoming.result()
+
+
+def export(venmo, path, resource='stories', fmt=None, chunk_size=5000, page_size=50, resume=True):
+    """
+    Stream every item of a listing to `path`, holding at most `chunk_size` items plus a page in memory
+
+    An interrupted export picks up at its last chunk when run again with the same arguments
+
+    :param venmo: Venmo - logged in client
+    :param resource: str - 'stories', 'payments', 'requests' or 'friends'
+    :param fmt: str - 'ndjson', 'csv' or 'parquet', guessed from the extension of `path` when None
+    :param resume: bool - continue from `path`'s checkpoint if there is one instead of starting over
+    :return: int - items exported
+    """
+    fmt = fmt or FORMATS.get(os.path.splitext(path)[1])
+    if fmt not in WRITERS:
+        raise ValueError(f'Unknown export format for {path}, pass one of {", ".join(WRITERS)}')
+    checkpoint = Checkpoint(path)
+    state = checkpoint.load() if resume else None
+    if state is not None and (state['resource'], state['format']) != (resource, fmt):
+        raise ValueError(f'{checkpoint.path} belongs to a {state["format"]} export of {state["resource"]}')
+    if state is not None and state['next_url'] is None:
+        # Interrupted after writing the last page, there's nothing left to fetch
+        checkpoint.clear()
+        return state['rows']
+    columns = COLUMNS[resource]
+    name, params = RESOURCES[resource](venmo, page_size)
+    writer = WRITERS[fmt](path, columns, state and state['position'])
+    rows = state['rows'] if state else 0
+    chunk = []
+    try:
+        for page, next_url in pages(venmo, name, params, state and state['next_url']):
+            chunk.extend(page.get('data') or ())
+            if len(chunk) >= chunk_size or next_url is None:
+                writer.write(chunk)
+                rows += len(chunk)
+                chunk = []
+                checkpoint.save({'resource': resource, 'format': fmt, 'next_url': next_url, 'rows': rows,
+                                 'position': writer.position()})
+    finally:
+        writer.close()
+    checkpoint.clear()
+    return rows
+
+
+def accounts_from_config(cfg):
+    """
+    :param cfg: ConfigParser - [login] and any number of [login:<name>] sections with username and password
+    :return: dict - account name: (username, password)
+    """
+    accounts = {}
+    for section in cfg.sections():
+        if section == 'login' or section.startswith('login:'):
+            username = cfg.get(section, 'username')
+            accounts[section.partition(':')[2] or username] = (username, cfg.get(section, 'password'))
+    return accounts
+
+
+def export_accounts(accounts, directory, resource='stories', fmt='ndjson', max_workers=4, login=None, **kwargs):
+    """
+    Export many accounts concurrently, each to `<directory>/<name>-<resource>.<fmt>`
+
+    :param accounts: dict - account name: (username, password) eg. accounts_from_config(cfg)
+    :param login: callable - login(username, password) returning a logged in Venmo, a plain Venmo login when None
+    :param kwargs: passed on to export eg. chunk_size
+    :return: generator - ExportResult per account in order of completion
+    """
+    if login is None:
+        from .client import Venmo
+
+        def login(username, password):
+            venmo = Venmo()
+            venmo.login(username, password)
+            return venmo
+    os.makedirs(directory, exist_ok=True)
+
+    def run(username, password, path):
+        return export(login(username, password), path, resource, fmt, **kwargs)
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='venmo-export') as executor:
+        futures = {}
+        for account, (username, password) in accounts.items():
+            path = os.path.join(directory, f'{account}-{resource}{WRITERS[fmt].extension}')
+            futures[executor.submit(run, username, password, path)] = (account, path)
+        for future in as_completed(futures):
+            account, path = futures[future]
+            error = future.exception()
+            yield ExportResult(account, path, None if error else future.result(), error)
@@ -0,0 +1,141 @@
+import time
+import random
+import threading
+import requests
+from email.utils import parsedate_to_datetime
+from urllib3.exceptions import NewConnectionError
+
+
+class RateLimiter:
+    """
+    Token bucket, share one instance between threads, accounts and clients to keep their combined request rate under `rate`
+
+    :param rate: float - requests per second
+    :param burst: int - requests allowed back to back after being idle, rate when None
+    """
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.burst = burst or max(1, int(rate))
+        self._tokens = self.burst
+        self._updated_at = time.monotonic()
+        self._paused_until = 0
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """
+        Take a token
+
+        :return: float - seconds the caller has to wait before sending its request
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+            self._tokens -= 1
+            wait = 0 if self._tokens >= 0 else -self._tokens / self.rate
+            return max(wait, self._paused_until - now)
+
+    def acquire(self):
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    def pause(self, seconds):
+        """
+        Hold back every user of the bucket eg. after the server answered 429 with Retry-After
+        """
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+
+class RetryPolicy:
+    """
+    Exponential backoff with full jitter for transient failures
+
+    Requests whose method isn't idempotent are only retried when the server can't have acted on them,
+    ie. on 429 or when the connection couldn't be established, so calls like change_password never double fire
+
+    :param retries: int - attempts after the first one, 0 disables retrying
+    :param backoff: float - seconds the first retry waits at most, doubling with every further attempt
+    """
+    def __init__(self, retries=3, backoff=0.5, max_backoff=30, statuses=(429, 500, 502, 503, 504),
+                 idempotent_methods=('GET', 'HEAD', 'OPTIONS')):
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.statuses = frozenset(statuses)
+        self.idempotent_methods = frozenset(idempotent_methods)
+
+    def should_retry(self, attempt, method, status=None, error=None):
+        if attempt >= self.retries:
+            return False
+        if error is not None:
+            return method in self.idempotent_methods or is_connect_error(error)
+        if status not in self.statuses:
+            return False
+        return status == 429 or method in self.idempotent_methods
+
+    def delay(self, attempt, headers=None):
+        """
+        :param headers: mapping - response headers, their Retry-After wins over the computed backoff
+        """
+        retry_after = retry_after_seconds(headers)
+        if retry_after is not None:
+            return retry_after
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+
+def retry_after_seconds(headers):
+    value = None if headers is None else headers.get('Retry-After')
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def is_connect_error(error):
+    """
+    True for errors raised before the request reached the server, for both requests and httpx
+    """
+    if isinstance(error, requests.ConnectTimeout) or type(error).__name__ in ('ConnectError', 'ConnectTimeout'):
+        return True
+    reason = getattr(error.args[0] if error.args else None, 'reason', None)
+    return isinstance(reason, NewConnectionError)
+
+
+class GovernedSession(requests.Session):
+    """
+    requests.Session that retries transient failures according to a RetryPolicy and paces itself with a RateLimiter
+    """
+    def __init__(self, retry=None, rate_limiter=None):
+        super().__init__()
+        self.retry = RetryPolicy() if retry is None else retry
+        self.rate_limiter = rate_limiter
+
+    def request(self, method, url, *args, **kwargs):
+        method = method.upper()
+        attempt = 0
+        while True:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            try:
+                response = super().request(method, url, *args, **kwargs)
+            except requests.RequestException as e:
+                if not self.retry.should_retry(attempt, method, error=e):
+                    raise
+                delay = self.retry.delay(attempt)
+            else:
+                if not self.retry.should_retry(attempt, method, status=response.status_code):
+                    return response
+                delay = self.retry.delay(attempt, response.headers)
+                if response.status_code == 429 and self.rate_limiter is not None:
+                    self.rate_limiter.pause(delay)
+                response.close()
+            time.sleep(delay)
+            attempt += 1
@@ -0,0 +1,143 @@
+import threading
+from collections import namedtuple
+
+
+RequestEvent = namedtuple('RequestEvent', ['endpoint', 'method', 'status', 'size', 'error', 'connect', 'ttfb', 'total', 'decode'],
+                          defaults=(None,) * 8)
+RequestEvent.__doc__ = """
+One measurement handed to the Instrumentation sinks, fields that weren't measured are None
+
+Requests fill in method, status or error, size (body bytes) and the connect, ttfb (time to first byte) and total
+seconds, decoding the body afterwards is recorded as a separate event with only `decode` set
+"""
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, float('inf'))
+PHASES = ('connect', 'ttfb', 'total', 'decode')
+
+
+class Instrumentation:
+    """
+    Fans RequestEvents out to sinks - StatsSink, PrometheusSink, CallbackSink or anything with a record(event) method
+
+    venmo.instrumentation = Instrumentation(stats, CallbackSink(print))
+    """
+    def __init__(self, *sinks):
+        self.sinks = list(sinks)
+
+    def record(self, event):
+        for sink in self.sinks:
+            sink.record(event)
+
+
+class CallbackSink:
+    def __init__(self, callback):
+        self.callback = callback
+
+    def record(self, event):
+        self.callback(event)
+
+
+class StatsSink:
+    """
+    In memory per endpoint request/error counts, response bytes and latency histograms for every phase
+    """
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.endpoints = {}
+        self._lock = threading.Lock()
+
+    def record(self, event):
+        with self._lock:
+            stats = self.endpoints.get(event.endpoint)
+            if stats is None:
+                stats = self.endpoints[event.endpoint] = {
+                    'requests': 0,
+                    'errors': 0,
+                    'bytes': 0,
+                    'statuses': {},
+                    'latency': {phase: {'count': 0, 'sum': 0.0, 'max': 0.0, 'buckets': [0] * len(self.buckets)} for phase in PHASES}
+                }
+            if event.total is not None:
+                stats['requests'] += 1
+                stats['bytes'] += event.size or 0
+                if event.error is not None or event.status >= 400:
+                    stats['errors'] += 1
+                status = event.error or event.status
+                stats['statuses'][status] = stats['statuses'].get(status, 0) + 1
+            for phase in PHASES:
+                seconds = getattr(event, phase)
+                if seconds is None:
+                    continue
+                histogram = stats['latency'][phase]
+                histogram['count'] += 1
+                histogram['sum'] += seconds
+                histogram['max'] = max(histogram['max'], seconds)
+                for i, bound in enumerate(self.buckets):
+                    if seconds <= bound:
+                        histogram['buckets'][i] += 1
+                        break
+
+    def quantile(self, endpoint, q, phase='total'):
+        """
+        :return: float - upper bound of the histogram bucket holding the `q` quantile, None without samples
+        """
+        with self._lock:
+            histogram = self.endpoints.get(endpoint, {}).get('latency', {}).get(phase)
+            if not histogram or not histogram['count']:
+                return None
+            rank = q * histogram['count']
+            seen = 0
+            for bound, count in zip(self.buckets, histogram['buckets']):
+                seen += count
+                if seen >= rank:
+                    return min(bound, histogram['max'])
+            return histogram['max']
+
+    def summary(self):
+        """
+        :return: dict - endpoint: {requests, errors, error_rate, bytes, mean and p50/p99 total seconds}
+        """
+        summary = {}
+        for endpoint in list(self.endpoints):
+            stats = self.endpoints[endpoint]
+            total = stats['latency']['total']
+            summary[endpoint] = {
+                'requests': stats['requests'],
+                'errors': stats['errors'],
+                'error_rate': stats['errors'] / stats['requests'] if stats['requests'] else 0.0,
+                'bytes': stats['bytes'],
+                'mean': total['sum'] / total['count'] if total['count'] else None,
+                'p50': self.quantile(endpoint, 0.5),
+                'p99': self.quantile(endpoint, 0.99),
+            }
+        return summary
+
+
+class PrometheusSink(StatsSink):
+    """
+    StatsSink rendered in the Prometheus text exposition format, serve exposition() from a /metrics handler
+    """
+    def exposition(self):
+        requests_total, errors_total, bytes_total, seconds = [], [], [], []
+        with self._lock:
+            for endpoint, stats in sorted(self.endpoints.items()):
+                for status, count in sorted(stats['statuses'].items(), key=str):
+                    requests_total.append(f'venmo_requests_total{{endpoint="{endpoint}",status="{status}"}} {count}')
+                errors_total.append(f'venmo_request_errors_total{{endpoint="{endpoint}"}} {stats["errors"]}')
+                bytes_total.append(f'venmo_response_bytes_total{{endpoint="{endpoint}"}} {stats["bytes"]}')
+                for phase, histogram in stats['latency'].items():
+                    if not histogram['count']:
+                        continue
+                    labels = f'endpoint="{endpoint}",phase="{phase}"'
+                    cumulative = 0
+                    for bound, count in zip(self.buckets, histogram['buckets']):
+                        cumulative += count
+                        le = '+Inf' if bound == float('inf') else repr(bound)
+                        seconds.append(f'venmo_request_seconds_bucket{{{labels},le="{le}"}} {cumulative}')
+                    seconds.append(f'venmo_request_seconds_sum{{{labels}}} {histogram["sum"]}')
+                    seconds.append(f'venmo_request_seconds_count{{{labels}}} {histogram["count"]}')
+        lines = ['# TYPE venmo_requests_total counter', *requests_total,
+                 '# TYPE venmo_request_errors_total counter', *errors_total,
+                 '# TYPE venmo_response_bytes_total counter', *bytes_total,
+                 '# TYPE venmo_request_seconds histogram', *seconds]
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,116 @@
+import json
+import codecs
+
+try:
+    from orjson import dumps, loads
+except ImportError:
+    loads = json.loads
+
+    def dumps(obj):
+        return json.dumps(obj, separators=(',', ':')).encode()
+
+WHITESPACE = ' \t\n\r'
+
+
+class ArrayStream:
+    """
+    Single pass incremental parser yielding the items of one array inside a streamed JSON object
+
+    Only the current item is decoded at a time, every other top level member is kept in `rest` once iteration is over
+
+    stream = ArrayStream(response.iter_content(65536), key='data')
+    for item in stream:
+        ...
+    stream.rest['pagination']
+    """
+    def __init__(self, chunks, key='data', compact_at=1 << 16):
+        """
+        :param chunks: iterable - bytes or str pieces of the document eg. response.iter_content()
+        :param key: str - top level member whose array items are yielded
+        """
+        self.key = key
+        self.rest = {}
+        self._chunks = iter(chunks)
+        self._utf8 = codecs.getincrementaldecoder('utf-8')()
+        self._decoder = json.JSONDecoder()
+        self._buffer = ''
+        self._pos = 0
+        self._eof = False
+        self._compact_at = compact_at
+
+    def __iter__(self):
+        self._expect('{')
+        if self._peek() == '}':
+            self._pos += 1
+            return
+        while True:
+            member = self._value()
+            self._expect(':')
+            if member == self.key and self._peek() == '[':
+                self._pos += 1
+                if self._peek() == ']':
+                    self._pos += 1
+                else:
+                    while True:
+                        yield self._value()
+                        if self._next() == ']':
+                            break
+            else:
+                self.rest[member] = self._value()
+            if self._next() == '}':
+                return
+
+    def _fill(self):
+        """
+        :return: bool - False once the input is exhausted
+        """
+        if self._eof:
+            return False
+        if self._pos > self._compact_at:
+            self._buffer = self._buffer[self._pos:]
+            self._pos = 0
+        for chunk in self._chunks:
+            if isinstance(chunk, bytes):
+                chunk = self._utf8.decode(chunk)
+            if chunk:
+                self._buffer += chunk
+                return True
+        self._eof = True
+        self._buffer += self._utf8.decode(b'', final=True)
+        return False
+
+    def _peek(self):
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                raise ValueError('Unexpected end of JSON document')
+
+    def _next(self):
+        char = self._peek()
+        if char not in ',]}':
+            raise ValueError(f'Expected , ] or }} at {self._pos} got {char!r}')
+        self._pos += 1
+        return char
+
+    def _expect(self, char):
+        if self._peek() != char:
+            raise ValueError(f'Expected {char!r} at {self._pos} got {self._buffer[self._pos]!r}')
+        self._pos += 1
+
+    def _value(self):
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # A number ending right at the end of the buffer might continue in the next chunk
+            if end == len(self._buffer) and self._fill():
+                continue
+            self._pos = end
+            return value
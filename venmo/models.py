@@ -0,0 +1,143 @@
+class Model:
+    """
+    Compact typed view of a Venmo API object
+
+    FIELDS maps each attribute to its key in the API's JSON, a dotted path for nested values, optionally with the
+    Model class nested objects are built as. Only the attributes asked for are materialized, the rest stay None
+
+    User.from_dict(data, fields=('id', 'username'))
+    """
+    __slots__ = ()
+    FIELDS = {}
+
+    def __init__(self, **values):
+        for attribute in self.__slots__:
+            setattr(self, attribute, values.get(attribute))
+
+    @classmethod
+    def builder(cls, fields=None):
+        """
+        :param fields: iterable - attributes to materialize, all of them when None
+        :return: callable - building a `cls` from one decoded JSON object, resolve it once per listing
+        """
+        fields = tuple(cls.FIELDS) if fields is None else tuple(fields)
+        unknown = set(fields) - set(cls.FIELDS)
+        if unknown:
+            raise ValueError(f'{cls.__name__} has no fields {", ".join(sorted(unknown))}')
+        plan = []
+        for attribute in fields:
+            spec = cls.FIELDS[attribute]
+            key, model = spec if isinstance(spec, tuple) else (spec, None)
+            plan.append((attribute, key.split('.'), None if model is None else model.builder()))
+        skipped = tuple(attribute for attribute in cls.__slots__ if attribute not in fields)
+
+        def build(data):
+            instance = cls.__new__(cls)
+            for attribute, path, nested in plan:
+                value = data
+                for key in path:
+                    value = value.get(key) if isinstance(value, dict) else None
+                if nested is not None and value is not None:
+                    value = nested(value)
+                setattr(instance, attribute, value)
+            for attribute in skipped:
+                setattr(instance, attribute, None)
+            return instance
+        return build
+
+    @classmethod
+    def from_dict(cls, data, fields=None):
+        return cls.builder(fields)(data)
+
+    @classmethod
+    def from_page(cls, page, fields=None):
+        """
+        :param page: dict - decoded listing response eg. PaymentMethod.from_page(venmo.get_payment_methods())
+        """
+        return list(map(cls.builder(fields), page.get('data') or ()))
+
+    def to_dict(self):
+        """
+        :return: dict - attribute: value with nested models flattened to dicts too
+        """
+        return {
+            attribute: value.to_dict() if isinstance(value, Model) else value
+            for attribute, value in ((attribute, getattr(self, attribute)) for attribute in self.__slots__)
+        }
+
+    def __eq__(self, other):
+        return type(self) is type(other) and all(getattr(self, a) == getattr(other, a) for a in self.__slots__)
+
+    def __repr__(self):
+        values = ', '.join(f'{a}={getattr(self, a)!r}' for a in self.__slots__ if getattr(self, a) is not None)
+        return f'{type(self).__name__}({values})'
+
+
+class User(Model):
+    __slots__ = ('id', 'username', 'display_name', 'first_name', 'last_name', 'phone', 'email', 'is_active',
+                 'date_joined', 'profile_picture_url')
+    FIELDS = {
+        'id':                   'id',
+        'username':             'username',
+        'display_name':         'display_name',
+        'first_name':           'first_name',
+        'last_name':            'last_name',
+        'phone':                'phone',
+        'email':                'email',
+        'is_active':            'is_active',
+        'date_joined':          'date_joined',
+        'profile_picture_url':  'profile_picture_url',
+    }
+
+
+class Payment(Model):
+    __slots__ = ('id', 'action', 'status', 'amount', 'note', 'audience', 'date_created', 'date_completed', 'actor',
+                 'target')
+    FIELDS = {
+        'id':              'id',
+        'action':          'action',
+        'status':          'status',
+        'amount':          'amount',
+        'note':            'note',
+        'audience':        'audience',
+        'date_created':    'date_created',
+        'date_completed':  'date_completed',
+        'actor':           ('actor', User),
+        'target':          ('target.user', User),
+    }
+
+
+class Story(Model):
+    __slots__ = ('id', 'type', 'date_updated', 'audience', 'note', 'payment')
+    FIELDS = {
+        'id':            'id',
+        'type':          'type',
+        'date_updated':  'date_updated',
+        'audience':      'audience',
+        'note':          'note',
+        'payment':       ('payment', Payment),
+    }
+
+
+class PaymentMethod(Model):
+    __slots__ = ('id', 'type', 'name', 'last_four', 'peer_payment_role', 'merchant_payment_role', 'bank_name')
+    FIELDS = {
+        'id':                     'id',
+        'type':                   'type',
+        'name':                   'name',
+        'last_four':              'last_four',
+        'peer_payment_role':      'peer_payment_role',
+        'merchant_payment_role':  'merchant_payment_role',
+        'bank_name':              'bank_account.bank.name',
+    }
+
+
+class Device(Model):
+    __slots__ = ('user_device_id', 'name', 'device_type', 'date_created', 'date_last_used')
+    FIELDS = {
+        'user_device_id':  'user_device_id',
+        'name':            'name',
+        'device_type':     'device_type',
+        'date_created':    'date_created',
+        'date_last_used':  'date_last_used',
+    }
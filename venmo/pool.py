@@ -0,0 +1,128 @@
+from requests.adapters import HTTPAdapter
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from .client import Venmo
+from .governor import GovernedSession
+
+
+PoolResult = namedtuple('PoolResult', ['account', 'call', 'result', 'error'])
+
+
+class VenmoPool:
+    """
+    Many Venmo accounts sharing one bounded connection pool per host and a worker pool for batch calls
+
+    pool = VenmoPool(max_workers=16)
+    pool.add('alice', 'password')
+    pool.add('bob', 'password')
+    for account, call, result, error in pool.run('get_account', 'get_alerts'):
+        ...
+    """
+    def __init__(self, max_workers=8, pool_maxsize=None, token_store=None, retry=None, rate_limiter=None, http2=False):
+        """
+        :param max_workers: int - most calls in flight at once across every account
+        :param pool_maxsize: int - most open connections per host (venmo.com, api.venmo.com), max_workers when None
+        :param token_store: TokenStore - shared by the Venmo clients add creates
+        :param rate_limiter: RateLimiter - pacing the combined requests of every account
+        :param http2: bool - multiplex every account's calls over one HTTP/2 connection per host, requires httpx[http2]
+        """
+        self.max_workers = max_workers
+        self.token_store = token_store
+        self.retry = retry
+        self.rate_limiter = rate_limiter
+        self.http2 = http2
+        if http2:
+            from .transport import HTTP2Adapter, http2_client
+            self.adapter = HTTP2Adapter(http2_client(max_connections=pool_maxsize or max_workers))
+        else:
+            # One urllib3 pool per host inside a single adapter mounted on every account's session,
+            # connections are reused across accounts while cookies stay per session
+            self.adapter = HTTPAdapter(pool_connections=2, pool_maxsize=pool_maxsize or max_workers, pool_block=True)
+        self.accounts = OrderedDict()  # username: Venmo
+        self._passwords = {}
+        self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return len(self.accounts)
+
+    def session(self):
+        session = GovernedSession(self.retry, self.rate_limiter)
+        session.mount('https://', self.adapter)
+        session.mount('http://', self.adapter)
+        return session
+
+    def add(self, username, password=None, venmo=None):
+        """
+        Register an account, it is logged in by the next login() call unless an authenticated `venmo` is passed
+
+        :return: Venmo - the client for `username`
+        """
+        if venmo is None:
+            venmo = Venmo(session=self.session(), token_store=self.token_store)
+        else:
+            venmo.session.mount('https://', self.adapter)
+            venmo.session.mount('http://', self.adapter)
+        venmo.http2 = self.http2
+        self.accounts[username] = venmo
+        if password is not None:
+            self._passwords[username] = password
+        return venmo
+
+    def login(self):
+        """
+        Log in every account added with a password that isn't logged in yet
+
+        :return: generator - PoolResult per account in order of completion
+        """
+        pending = [username for username in self._passwords if self.accounts[username].access_token is None]
+        return self.map(lambda venmo, username: venmo.login(username, self._passwords[username]), 'login', pending)
+
+    def run(self, *calls, accounts=None):
+        """
+        :param calls: str or tuple - method names, or (name, args, kwargs) tuples, to call on every account
+        :param accounts: iterable - usernames to run against, all accounts when None
+        :return: generator - PoolResult per account and call in order of completion
+        """
+        futures = {}
+        executor = self._get_executor()
+        for username in self.accounts if accounts is None else accounts:
+            venmo = self.accounts[username]
+            for call in calls:
+                name, args, kwargs = (call, (), {}) if isinstance(call, str) else call
+                futures[executor.submit(getattr(venmo, name), *args, **kwargs)] = (username, name)
+        return self._results(futures)
+
+    def map(self, fn, call=None, accounts=None):
+        """
+        :param fn: callable - fn(venmo, username) run for every account
+        :return: generator - PoolResult per account in order of completion
+        """
+        executor = self._get_executor()
+        futures = {}
+        for username in self.accounts if accounts is None else accounts:
+            futures[executor.submit(fn, self.accounts[username], username)] = (username, call or getattr(fn, '__name__', None))
+        return self._results(futures)
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        self.adapter.close()
+
+    def _get_executor(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='venmo-pool')
+        return self._executor
+
+    def _results(self, futures):
+        for future in as_completed(futures):
+            username, call = futures[future]
+            error = future.exception()
+            yield PoolResult(username, call, None if error else future.result(), error)
@@ -0,0 +1,115 @@
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from .cache import TTLCache
+
+MISSING = object()
+
+PHONE = re.compile(r'\+?[\d\s().-]{10,}')
+
+
+def normalize_query(query):
+    """
+    Memo key a username, email, phone number or user id is looked up by eg. '@Alice' -> 'alice', '+1 (555) 010-0000' -> '5550100000'
+    """
+    query = str(query).strip().lower()
+    if PHONE.fullmatch(query):
+        digits = re.sub(r'\D', '', query)
+        return digits[1:] if len(digits) == 11 and digits[0] == '1' else digits
+    return query.lstrip('@')
+
+
+def user_keys(user):
+    """
+    :return: set - every normalized query `user` answers to
+    """
+    keys = {str(user['id']).lower()} if user.get('id') is not None else set()
+    for field in ('username', 'email', 'phone'):
+        if user.get(field):
+            keys.add(normalize_query(user[field]))
+    return keys
+
+
+class ResolveError(Exception):
+    """
+    Raised once every lookup of a resolve finished when some of them failed
+
+    :param resolved: dict - query: user of the queries that were resolved, None when nobody matched
+    :param errors: dict - query: exception of the failed lookups, they aren't memoized and are searched again next time
+    """
+    def __init__(self, resolved, errors):
+        super().__init__(f'{len(errors)} of {len(resolved) + len(errors)} queries failed to resolve eg. '
+                         f'{next(iter(errors))!r}: {next(iter(errors.values()))!r}')
+        self.resolved = resolved
+        self.errors = errors
+
+
+class UserResolver:
+    """
+    Memoized username/email/phone to user resolution for one Venmo client
+
+    Lookups are answered from the memo first, then from the account's friends list, loaded once per `ttl`,
+    and only then searched with concurrent search_user calls. Queries matching nobody are remembered for `negative_ttl`
+    """
+    def __init__(self, venmo, maxsize=10000, ttl=3600, negative_ttl=300):
+        self.venmo = venmo
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.memo = TTLCache(maxsize)
+        self.searches = 0
+        self._friends_loaded_at = None
+
+    def resolve(self, queries, max_workers=8, friends=True):
+        """
+        :return: dict - query: user dict, None when nobody matched it exactly - ResolveError is raised instead,
+                 once every lookup finished, when any search failed
+        """
+        keys = {query: normalize_query(query) for query in queries}
+        found = {}
+        for key in set(keys.values()):
+            user = self.memo.get(key, MISSING)
+            if user is not MISSING:
+                found[key] = user
+        remaining = set(keys.values()) - set(found)
+        if remaining and friends:
+            self.load_friends()
+            for key in list(remaining):
+                user = self.memo.get(key, MISSING)
+                if user is not MISSING:
+                    found[key] = user
+                    remaining.discard(key)
+        failed = {}
+        if remaining:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(remaining)), thread_name_prefix='venmo-resolve') as executor:
+                futures = {executor.submit(self.search, key): key for key in remaining}
+                for future in as_completed(futures):
+                    if future.exception() is None:
+                        found[futures[future]] = future.result()
+                    else:
+                        failed[futures[future]] = future.exception()
+        if failed:
+            raise ResolveError({query: found[key] for query, key in keys.items() if key in found},
+                               {query: failed[key] for query, key in keys.items() if key in failed})
+        return {query: found[key] for query, key in keys.items()}
+
+    def search(self, key):
+        self.searches += 1
+        users = self.venmo.search_user(key).get('data') or ()
+        match = next((user for user in users if key in user_keys(user)), None)
+        self.remember(match, key)
+        return match
+
+    def remember(self, user, key=None):
+        if user is None:
+            self.memo.set(key, None, self.negative_ttl)
+            return
+        for user_key in user_keys(user) | ({key} if key else set()):
+            self.memo.set(user_key, user, self.ttl)
+
+    def load_friends(self, force=False):
+        if not force and self._friends_loaded_at is not None and time.monotonic() - self._friends_loaded_at < self.ttl:
+            return
+        for friend in self.venmo.iter_friends():
+            self.remember(friend)
+        self._friends_loaded_at = time.monotonic()
@@ -0,0 +1,128 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+
+
+def fernet(key):
+    """
+    :param key: bytes - Fernet key eg. cryptography.fernet.Fernet.generate_key(), requires cryptography
+    :return: Fernet - None without a key
+    """
+    if key is None:
+        return None
+    from cryptography.fernet import Fernet
+    return Fernet(key)
+
+
+class TokenStore:
+    """
+    Where logged in sessions are persisted so later processes can skip Venmo.login's network round trips
+
+    Subclasses map a login username to the dict returned by VenmoBase.session_state
+    """
+    def load(self, username):
+        raise NotImplementedError
+
+    def save(self, username, state):
+        raise NotImplementedError
+
+    def delete(self, username):
+        raise NotImplementedError
+
+
+class FileTokenStore(TokenStore):
+    """
+    JSON file readable only by its owner, encrypted when a key is given
+
+    :param key: bytes - Fernet key eg. cryptography.fernet.Fernet.generate_key(), requires cryptography
+    """
+    def __init__(self, path, key=None):
+        self.path = path
+        self._fernet = fernet(key)
+        self._lock = threading.Lock()
+
+    def load(self, username):
+        with self._lock:
+            return self._read().get(username)
+
+    def save(self, username, state):
+        with self._lock:
+            states = self._read()
+            states[username] = state
+            self._write(states)
+
+    def delete(self, username):
+        with self._lock:
+            states = self._read()
+            if states.pop(username, None) is not None:
+                self._write(states)
+
+    def _read(self):
+        try:
+            with open(self.path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            return {}
+        if self._fernet is not None:
+            data = self._fernet.decrypt(data)
+        return json.loads(data)
+
+    def _write(self, states):
+        data = json.dumps(states).encode()
+        if self._fernet is not None:
+            data = self._fernet.encrypt(data)
+        tmp_path = f'{self.path}.tmp'
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, self.path)
+
+
+class SqliteTokenStore(TokenStore):
+    """
+    sqlite database readable only by its owner, states encrypted when a key is given, shareable between threads
+
+    :param key: bytes - Fernet key eg. cryptography.fernet.Fernet.generate_key(), requires cryptography
+    """
+    def __init__(self, path, key=None):
+        self.path = path
+        self._fernet = fernet(key)
+        # Created owner only before sqlite opens it, its journal files copy the database's permissions
+        os.close(os.open(path, os.O_RDWR | os.O_CREAT, 0o600))
+        os.chmod(path, 0o600)
+        self._db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._db:
+            self._db.execute('CREATE TABLE IF NOT EXISTS tokens (username TEXT PRIMARY KEY, state TEXT NOT NULL, updated_at REAL NOT NULL)')
+
+    def close(self):
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def load(self, username):
+        with self._lock:
+            row = self._db.execute('SELECT state FROM tokens WHERE username = ?', (username,)).fetchone()
+        if row is None:
+            return None
+        data = row[0].encode()
+        if self._fernet is not None:
+            data = self._fernet.decrypt(data)
+        return json.loads(data)
+
+    def save(self, username, state):
+        data = json.dumps(state).encode()
+        if self._fernet is not None:
+            data = self._fernet.encrypt(data)
+        with self._lock, self._db:
+            self._db.execute('INSERT OR REPLACE INTO tokens VALUES (?, ?, ?)', (username, data.decode(), time.time()))
+
+    def delete(self, username):
+        with self._lock, self._db:
+            self._db.execute('DELETE FROM tokens WHERE username = ?', (username,))
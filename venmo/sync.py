@@ -0,0 +1,290 @@
+import json
+import time
+import sqlite3
+import threading
+from itertools import islice
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS transactions (
+    account                TEXT NOT NULL,
+    id                     TEXT NOT NULL,
+    action                 TEXT,
+    status                 TEXT,
+    amount                 REAL,
+    note                   TEXT,
+    audience               TEXT,
+    date_created           TEXT,
+    date_updated           TEXT,
+    counterparty           TEXT,
+    counterparty_username  TEXT,
+    outgoing               INTEGER,
+    raw                    TEXT NOT NULL,
+    PRIMARY KEY (account, id)
+);
+CREATE INDEX IF NOT EXISTS transactions_counterparty ON transactions (account, counterparty);
+CREATE INDEX IF NOT EXISTS transactions_counterparty_username ON transactions (account, counterparty_username);
+CREATE INDEX IF NOT EXISTS transactions_date ON transactions (account, date_created);
+CREATE INDEX IF NOT EXISTS transactions_status ON transactions (account, status, action);
+
+CREATE TABLE IF NOT EXISTS friends (
+    account       TEXT NOT NULL,
+    id            TEXT NOT NULL,
+    username      TEXT,
+    display_name  TEXT,
+    raw           TEXT NOT NULL,
+    PRIMARY KEY (account, id)
+);
+CREATE INDEX IF NOT EXISTS friends_username ON friends (account, username);
+
+CREATE TABLE IF NOT EXISTS sync_state (
+    account     TEXT NOT NULL,
+    resource    TEXT NOT NULL,
+    high_water  TEXT,
+    synced_at   REAL NOT NULL,
+    PRIMARY KEY (account, resource)
+);
+"""
+
+UPSERT_TRANSACTION = 'INSERT OR REPLACE INTO transactions VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)'
+
+PENDING_STATUSES = ('pending', 'held')
+
+# Bulk inserts are committed every this many rows
+BATCH_SIZE = 500
+
+
+class SyncStore:
+    """
+    Local sqlite mirror of accounts' transactions, friends and sync high-water marks, shareable between accounts
+
+    Every query is answered from disk without touching the API
+    """
+    def __init__(self, path):
+        self.path = path
+        self._db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock, self._db:
+            self._db.execute('PRAGMA journal_mode=WAL')
+            self._db.executescript(SCHEMA)
+
+    def close(self):
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def high_water(self, account, resource):
+        with self._lock:
+            row = self._db.execute('SELECT high_water FROM sync_state WHERE account = ? AND resource = ?',
+                                   (account, resource)).fetchone()
+        return None if row is None else row['high_water']
+
+    def synced_at(self, account, resource):
+        with self._lock:
+            row = self._db.execute('SELECT synced_at FROM sync_state WHERE account = ? AND resource = ?',
+                                   (account, resource)).fetchone()
+        return None if row is None else row['synced_at']
+
+    def set_high_water(self, account, resource, high_water):
+        with self._lock, self._db:
+            self._db.execute('INSERT OR REPLACE INTO sync_state VALUES (?, ?, ?, ?)', (account, resource, high_water, time.time()))
+
+    def upsert_transactions(self, account, payments):
+        """
+        :param payments: iterable - payment dicts as found in the payments listing
+        :return: int - rows written
+        """
+        return self._write(UPSERT_TRANSACTION, (transaction_row(account, payment) for payment in payments))
+
+    def upsert_stories(self, account, stories):
+        """
+        :param stories: iterable - feed stories, the payment of each is stored with the story's date_updated
+        :return: int - rows written
+        """
+        rows = (transaction_row(account, story['payment'], story.get('date_updated'))
+                for story in stories if story.get('payment'))
+        return self._write(UPSERT_TRANSACTION, rows)
+
+    def resolve_missing_pending(self, account, action, pending_ids):
+        """
+        Rows still pending locally that the server no longer lists as pending were paid, declined or cancelled,
+        mark them 'resolved' until a story reports the final status
+
+        :return: int - rows updated
+        """
+        with self._lock, self._db:
+            placeholders = ','.join('?' * len(pending_ids))
+            exclude = f'AND id NOT IN ({placeholders})' if pending_ids else ''
+            cursor = self._db.execute(
+                f"UPDATE transactions SET status = 'resolved' WHERE account = ? AND action = ? "
+                f"AND status IN ('pending', 'held') {exclude}", (account, action, *pending_ids))
+            return cursor.rowcount
+
+    def replace_friends(self, account, friends):
+        rows = [(account, str(friend['id']), friend.get('username'), friend.get('display_name'), json.dumps(friend))
+                for friend in friends]
+        with self._lock, self._db:
+            self._db.execute('DELETE FROM friends WHERE account = ?', (account,))
+            self._db.executemany('INSERT OR REPLACE INTO friends VALUES (?, ?, ?, ?, ?)', rows)
+        return len(rows)
+
+    def transactions(self, account, counterparty=None, status=None, action=None, since=None, until=None, limit=None):
+        """
+        :param counterparty: str - user id or username of the other party
+        :param status: str or tuple - eg. ('pending', 'held')
+        :param action: str - 'pay' or 'charge'
+        :param since: str - ISO date_created lower bound, inclusive
+        :param until: str - ISO date_created upper bound, exclusive
+        :return: list - sqlite3.Row per transaction, newest first
+        """
+        where, args = ['account = ?'], [account]
+        if counterparty is not None:
+            where.append('(counterparty = ? OR counterparty_username = ?)')
+            args += [counterparty, counterparty]
+        if status is not None:
+            statuses = (status,) if isinstance(status, str) else tuple(status)
+            where.append(f'status IN ({",".join("?" * len(statuses))})')
+            args += statuses
+        if action is not None:
+            where.append('action = ?')
+            args.append(action)
+        if since is not None:
+            where.append('date_created >= ?')
+            args.append(since)
+        if until is not None:
+            where.append('date_created < ?')
+            args.append(until)
+        query = f'SELECT * FROM transactions WHERE {" AND ".join(where)} ORDER BY date_created DESC'
+        if limit is not None:
+            query += f' LIMIT {int(limit)}'
+        with self._lock:
+            return self._db.execute(query, args).fetchall()
+
+    def pending_charges(self, account, counterparty=None):
+        return self.transactions(account, counterparty=counterparty, status=PENDING_STATUSES, action='charge')
+
+    def pending_payments(self, account, counterparty=None):
+        return self.transactions(account, counterparty=counterparty, status=PENDING_STATUSES, action='pay')
+
+    def friends(self, account, username=None):
+        with self._lock:
+            if username is None:
+                return self._db.execute('SELECT * FROM friends WHERE account = ? ORDER BY username', (account,)).fetchall()
+            return self._db.execute('SELECT * FROM friends WHERE account = ? AND username = ?', (account, username)).fetchall()
+
+    def _write(self, statement, rows):
+        written = 0
+        rows = iter(rows)
+        while True:
+            batch = list(islice(rows, BATCH_SIZE))
+            if not batch:
+                return written
+            with self._lock, self._db:
+                self._db.executemany(statement, batch)
+            written += len(batch)
+
+
+def transaction_row(account, payment, date_updated=None):
+    actor = payment.get('actor') or {}
+    target = (payment.get('target') or {}).get('user') or {}
+    outgoing = str(actor.get('id')) == account
+    counterparty = target if outgoing else actor
+    return (
+        account,
+        str(payment['id']),
+        payment.get('action'),
+        payment.get('status'),
+        payment.get('amount'),
+        payment.get('note'),
+        payment.get('audience'),
+        payment.get('date_created'),
+        date_updated or payment.get('date_completed') or payment.get('date_created'),
+        None if counterparty.get('id') is None else str(counterparty['id']),
+        counterparty.get('username'),
+        int(outgoing),
+        json.dumps(payment),
+    )
+
+
+class SyncEngine:
+    """
+    Incrementally mirrors one account into a SyncStore
+
+    Stories are read newest first only down to the previous run's high-water mark, the short pending payment and
+    request listings are refreshed in full, and friends at most every `friends_interval` seconds
+
+    engine = SyncEngine(venmo, SyncStore('venmo.db'))
+    engine.sync()
+    engine.store.pending_charges(engine.account, counterparty='alice')
+    """
+    def __init__(self, venmo, store, friends_interval=24 * 60 * 60, page_size=50):
+        self.venmo = venmo
+        self.store = store
+        self.friends_interval = friends_interval
+        self.page_size = page_size
+
+    @property
+    def account(self):
+        """
+        The account's external id, the id v1 payments name their actor and target by
+        """
+        return str(self.venmo.external_id)
+
+    def sync(self):
+        """
+        :return: dict - rows written per resource
+        """
+        return {
+            'stories': self.sync_stories(),
+            'pending': self.sync_pending(),
+            'friends': self.sync_friends(),
+        }
+
+    def sync_stories(self):
+        account = self.account
+        high_water = self.store.high_water(account, 'stories')
+        newest = high_water
+        written = 0
+        batch = []
+        stories = self.venmo.iter_stories(limit=self.page_size)
+        try:
+            for story in stories:
+                updated = story.get('date_updated') or ''
+                # The feed is newest first, everything below the high-water mark is already stored
+                if high_water is not None and updated < high_water:
+                    break
+                if newest is None or updated > newest:
+                    newest = updated
+                batch.append(story)
+                if len(batch) >= BATCH_SIZE:
+                    written += self.store.upsert_stories(account, batch)
+                    batch = []
+        finally:
+            stories.close()
+        written += self.store.upsert_stories(account, batch)
+        if newest is not None:
+            self.store.set_high_water(account, 'stories', newest)
+        return written
+
+    def sync_pending(self):
+        account = self.account
+        written = 0
+        for action in ('pay', 'charge'):
+            pending = list(self.venmo.iter_payments(action=action, status=','.join(PENDING_STATUSES), limit=self.page_size))
+            written += self.store.upsert_transactions(account, pending)
+            self.store.resolve_missing_pending(account, action, [str(payment['id']) for payment in pending])
+        self.store.set_high_water(account, 'pending', None)
+        return written
+
+    def sync_friends(self, force=False):
+        account = self.account
+        synced_at = self.store.synced_at(account, 'friends')
+        if not force and synced_at is not None and time.time() - synced_at < self.friends_interval:
+            return 0
+        written = self.store.replace_friends(account, self.venmo.iter_friends())
+        self.store.set_high_water(account, 'friends', None)
+        return written
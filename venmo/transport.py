@@ -0,0 +1,324 @@
+import os
+import gzip
+import json
+import time
+import base64
+import threading
+import requests
+from http import HTTPStatus
+from contextlib import contextmanager
+from datetime import timedelta
+from collections import defaultdict
+from urllib.parse import urlsplit, parse_qsl, urlencode
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+# JSON keys whose values never reach a cassette
+SCRUBBED_KEYS = frozenset(('access_token', 'refresh_token', 'password', 'old_password', 'csrftoken2'))
+SCRUBBED = 'scrubbed'
+
+# Response headers left out of cassettes, bodies are stored decoded and cookies may carry credentials
+DROPPED_HEADERS = frozenset(('set-cookie', 'content-encoding', 'content-length', 'transfer-encoding', 'connection',
+                             'venmo-otp-secret'))
+
+
+def scrub(value):
+    if isinstance(value, dict):
+        return {key: SCRUBBED if key in SCRUBBED_KEYS and item is not None else scrub(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [scrub(item) for item in value]
+    return value
+
+
+def request_key(method, url):
+    """
+    Requests are matched on method, path and query, regardless of query order, host and headers
+    """
+    parts = urlsplit(url)
+    query = urlencode(sorted((key, SCRUBBED if key in SCRUBBED_KEYS else value) for key, value in parse_qsl(parts.query)))
+    return f'{method.upper()} {parts.path}?{query}'
+
+
+class CassetteMiss(LookupError):
+    """
+    Raised for a request the cassette has no response to, not a requests exception so it is never retried
+    """
+
+
+class Cassette:
+    """
+    Recorded request/response pairs, stored as gzipped JSON lines with tokens, passwords and cookies scrubbed
+    """
+    def __init__(self, path=None):
+        self.path = path
+        self.interactions = []
+
+    @classmethod
+    def load(cls, path):
+        cassette = cls(path)
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            cassette.interactions = [json.loads(line) for line in f if line.strip()]
+        return cassette
+
+    def save(self, path=None):
+        path = path or self.path
+        with gzip.open(f'{path}.tmp', 'wt', encoding='utf-8') as f:
+            for interaction in self.interactions:
+                f.write(json.dumps(interaction, separators=(',', ':')) + '\n')
+        os.replace(f'{path}.tmp', path)
+
+    def record(self, response, elapsed):
+        """
+        :param elapsed: float - seconds until the response headers arrived
+        """
+        content = response.content
+        try:
+            body = json.dumps(scrub(json.loads(content)), separators=(',', ':'))
+            encoding = 'json'
+        except ValueError:
+            body = base64.b64encode(content).decode('ascii')
+            encoding = 'base64'
+        self.interactions.append({
+            'key': request_key(response.request.method, response.request.url),
+            'status': response.status_code,
+            'headers': {name: value for name, value in response.headers.items() if name.lower() not in DROPPED_HEADERS},
+            'body': body,
+            'encoding': encoding,
+            'elapsed': round(elapsed, 6),
+        })
+
+
+class RecordingAdapter(BaseAdapter):
+    """
+    Sends requests through `adapter` and records every response into a Cassette, call save() when done
+
+    recorder = RecordingAdapter('session.cassette')
+    venmo = Venmo(transport=recorder)
+    ...
+    recorder.save()
+    """
+    def __init__(self, path, adapter=None):
+        super().__init__()
+        self.cassette = Cassette(path)
+        self.adapter = HTTPAdapter() if adapter is None else adapter
+        self._lock = threading.Lock()
+
+    def send(self, request, **kwargs):
+        started = time.perf_counter()
+        response = self.adapter.send(request, **kwargs)
+        # Session.send only sets response.elapsed after the adapter returns
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self.cassette.record(response, elapsed)
+        return response
+
+    def save(self):
+        with self._lock:
+            self.cassette.save()
+
+    def close(self):
+        self.adapter.close()
+
+
+class ReplayAdapter(BaseAdapter):
+    """
+    Serves a Cassette's responses without touching the network
+
+    Responses to the same request are served in recorded order, the last one repeating once they run out,
+    so a short recording can drive a long load test
+
+    :param timing: bool - hold each response back for as long as it originally took
+    :param speed: float - divides the recorded timings eg. 2 replays twice as fast
+    """
+    def __init__(self, cassette, timing=False, speed=1.0):
+        super().__init__()
+        self.cassette = Cassette.load(cassette) if isinstance(cassette, str) else cassette
+        self.timing = timing
+        self.speed = speed
+        self.served = 0
+        self._responses = defaultdict(list)
+        for interaction in self.cassette.interactions:
+            self._responses[interaction['key']].append(interaction)
+        self._next = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def send(self, request, **kwargs):
+        key = request_key(request.method, request.url)
+        with self._lock:
+            recorded = self._responses.get(key)
+            if not recorded:
+                raise CassetteMiss(f'No recorded response for {key}')
+            index = self._next[key]
+            self._next[key] = min(index + 1, len(recorded) - 1)
+            self.served += 1
+        interaction = recorded[index]
+        if self.timing and interaction['elapsed']:
+            time.sleep(interaction['elapsed'] / self.speed)
+        response = requests.Response()
+        response.status_code = interaction['status']
+        response.headers = CaseInsensitiveDict(interaction['headers'])
+        body = interaction['body']
+        response._content = body.encode() if interaction['encoding'] == 'json' else base64.b64decode(body)
+        # There's no raw stream, iter_content serves slices of the body instead
+        response._content_consumed = True
+        response.encoding = 'utf-8'
+        response.url = request.url
+        response.request = request
+        try:
+            response.reason = HTTPStatus(response.status_code).phrase
+        except ValueError:
+            response.reason = ''
+        response.elapsed = timedelta(seconds=interaction['elapsed'])
+        return response
+
+    def close(self):
+        pass
+
+
+# Connection-specific headers, forbidden in HTTP/2 requests
+HOP_BY_HOP_HEADERS = frozenset(('connection', 'keep-alive', 'proxy-connection', 'transfer-encoding', 'upgrade'))
+
+_shared_http2_client = None
+_shared_http2_lock = threading.Lock()
+
+
+def http2_client(max_connections=100, max_keepalive_connections=20, timeout=30.0, http2=True):
+    """
+    httpx.Client multiplexing concurrent requests over one connection per host, requires httpx[http2]
+    """
+    import httpx
+    limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_keepalive_connections)
+    return httpx.Client(http2=http2, limits=limits, timeout=timeout)
+
+
+def shared_http2_client():
+    """
+    Process wide client, every HTTP2Adapter created without one shares its connections across accounts
+    """
+    global _shared_http2_client
+    with _shared_http2_lock:
+        if _shared_http2_client is None or _shared_http2_client.is_closed:
+            _shared_http2_client = http2_client()
+        return _shared_http2_client
+
+
+class ConnectError(requests.ConnectionError):
+    """
+    The connection couldn't be established, the request never reached the server - see governor.is_connect_error
+    """
+
+
+@contextmanager
+def requests_errors(request, body=False):
+    """
+    Raise httpx errors as the requests exceptions HTTPAdapter raises for the same failure, so they are retried
+    and caught like any other
+
+    :param body: bool - errors come from reading the response body, where a broken connection is a
+                 ChunkedEncodingError rather than a ConnectionError
+    """
+    import httpx
+    try:
+        yield
+    except httpx.ConnectTimeout as e:
+        raise requests.ConnectTimeout(e, request=request)
+    except httpx.ConnectError as e:
+        raise ConnectError(e, request=request)
+    except httpx.TimeoutException as e:
+        raise requests.ReadTimeout(e, request=request)
+    except httpx.DecodingError as e:
+        raise requests.exceptions.ContentDecodingError(e, request=request)
+    except httpx.TransportError as e:
+        if body:
+            raise requests.exceptions.ChunkedEncodingError(e, request=request)
+        raise requests.ConnectionError(e, request=request)
+
+
+class HttpxRaw:
+    """
+    Just enough of urllib3's response for requests' iter_content to stream an httpx response
+    """
+    def __init__(self, response, request):
+        self.response = response
+        self.request = request
+
+    def stream(self, chunk_size, decode_content=True):
+        with requests_errors(self.request, body=True):
+            yield from self.response.iter_bytes(chunk_size)
+
+    def close(self):
+        self.response.close()
+
+    def release_conn(self):
+        self.response.close()
+
+
+class HTTP2Adapter(BaseAdapter):
+    """
+    requests adapter sending through an httpx.Client, so Venmo's sync calls share multiplexed HTTP/2 connections
+
+    venmo = Venmo(http2=True)
+
+    TLS verification, client certificates and proxies are the httpx client's, not the requests session's
+    """
+    # (id of httpx client, origin) already warmed up, shared since accounts share clients
+    _warmed = set()
+    _warm_up_lock = threading.Lock()
+
+    def __init__(self, client=None):
+        """
+        :param client: httpx.Client - shared_http2_client() when None
+        """
+        super().__init__()
+        self.client = shared_http2_client() if client is None else client
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        headers = [(name, value) for name, value in request.headers.items() if name.lower() not in HOP_BY_HOP_HEADERS]
+        extra = {} if timeout is None else {'timeout': timeout}
+        started = time.perf_counter()
+        with requests_errors(request):
+            upstream = self.client.send(self.client.build_request(request.method, request.url, headers=headers,
+                                                                  content=request.body, **extra), stream=True)
+        response = requests.Response()
+        response.status_code = upstream.status_code
+        # httpx decodes the body, the Content-Encoding no longer applies
+        response.headers = CaseInsensitiveDict((name, value) for name, value in upstream.headers.items()
+                                               if name.lower() != 'content-encoding')
+        response.reason = upstream.reason_phrase
+        response.url = str(upstream.url)
+        response.request = request
+        response.encoding = upstream.encoding
+        response.elapsed = timedelta(seconds=time.perf_counter() - started)
+        if stream:
+            response.raw = HttpxRaw(upstream, request)
+        else:
+            try:
+                with requests_errors(request, body=True):
+                    response._content = upstream.read()
+            finally:
+                upstream.close()
+            response._content_consumed = True
+        return response
+
+    def warm_up(self, url):
+        """
+        Open the connection to `url`'s host in the background so the first real request doesn't pay for it
+        """
+        key = (id(self.client), '{0.scheme}://{0.netloc}/'.format(urlsplit(url)))
+        with self._warm_up_lock:
+            if key in self._warmed:
+                return
+            self._warmed.add(key)
+        threading.Thread(target=self._warm_up, args=(key,), name='venmo-warm-up', daemon=True).start()
+
+    def _warm_up(self, key):
+        try:
+            self.client.head(key[1])
+        except Exception:
+            # Only a head start, the real request reports any error
+            with self._warm_up_lock:
+                self._warmed.discard(key)
+
+    def close(self):
+        if self.client is not _shared_http2_client:
+            self.client.close()
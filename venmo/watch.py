@@ -0,0 +1,226 @@
+import heapq
+import logging
+import itertools
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+NEW_ALERT = 'new_alert'
+NEW_CHARGE_REQUEST = 'new_charge_request'
+CHARGE_REQUEST_RESOLVED = 'charge_request_resolved'
+NEW_AUTHORIZATION = 'new_authorization'
+AUTHORIZATION_CAPTURED = 'authorization_captured'
+AUTHORIZATION_UPDATED = 'authorization_updated'
+POLL_FAILED = 'poll_failed'
+
+log = logging.getLogger(__name__)
+
+WatchEvent = namedtuple('WatchEvent', ['account', 'source', 'kind', 'item', 'previous'], defaults=(None,))
+WatchEvent.__doc__ = """
+:param account: str - label the client was added to the Watcher with
+:param source: str - 'alerts', 'authorizations' or 'requests'
+:param kind: str - one of the module's event constants eg. NEW_ALERT
+:param item: dict - the alert, authorization or payment, the exception for POLL_FAILED
+:param previous: str - status the item had when last seen, for status changes
+"""
+
+# Source: (listing call, event kind for a new item, event kind for an item gone from the listing)
+SOURCES = {
+    'alerts':          (lambda venmo: venmo.get_alerts(), NEW_ALERT, None),
+    'authorizations':  (lambda venmo: venmo.get_authorizations(), NEW_AUTHORIZATION, None),
+    'requests':        (lambda venmo: venmo.get_incomplete_requests(), NEW_CHARGE_REQUEST, CHARGE_REQUEST_RESOLVED),
+}
+
+
+def diff(account, source, seen, items):
+    """
+    :param seen: dict - id: status of the items of the previous poll
+    :return: tuple - (events, id: status of `items`)
+    """
+    _, new_kind, gone_kind = SOURCES[source]
+    events = []
+    current = {}
+    for item in items:
+        key = str(item.get('id'))
+        status = current[key] = item.get('status')
+        if key not in seen:
+            events.append(WatchEvent(account, source, new_kind, item))
+        elif seen[key] != status and source == 'authorizations':
+            kind = AUTHORIZATION_CAPTURED if status == 'captured' else AUTHORIZATION_UPDATED
+            events.append(WatchEvent(account, source, kind, item, seen[key]))
+    if gone_kind is not None:
+        events.extend(WatchEvent(account, source, gone_kind, {'id': key}, status)
+                      for key, status in seen.items() if key not in current)
+    return events, current
+
+
+class Job:
+    """
+    One account's source, polled every `interval` seconds which shrinks to min_interval on activity and grows when idle
+    """
+    def __init__(self, account, venmo, source, interval):
+        self.account = account
+        self.venmo = venmo
+        self.source = source
+        self.interval = interval
+        self.seen = None
+        self.removed = False
+
+
+class Watcher:
+    """
+    Polls alerts, authorizations and incomplete requests of many accounts from one scheduler thread and emits a
+    WatchEvent for every change
+
+    watcher = Watcher()
+    watcher.add('alice', alice_venmo)
+    watcher.subscribe(print)
+    watcher.start()
+
+    async def consume():
+        queue = watcher.async_queue()
+        while True:
+            event = await queue.get()
+    """
+    def __init__(self, min_interval=2.0, max_interval=60.0, backoff=1.5, max_workers=4, emit_initial=False):
+        """
+        :param backoff: float - factor the interval grows by after every poll without changes, up to max_interval
+        :param max_workers: int - most polls in flight at once across every account
+        :param emit_initial: bool - emit events for what the first poll of a source finds instead of only recording it
+        """
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.emit_initial = emit_initial
+        self.max_workers = max_workers
+        self.polls = 0
+        self._subscribers = []
+        self._jobs = {}  # (account, source): Job
+        self._heap = []  # (due, sequence, Job)
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._executor = None
+        self._thread = None
+        self._stopping = False
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def add(self, account, venmo, sources=tuple(SOURCES)):
+        """
+        :param account: str - label identifying the client in its events
+        :param venmo: Venmo - logged in client, replaces the one a source of `account` is already watched with
+        """
+        unknown = set(sources) - set(SOURCES)
+        if unknown:
+            raise ValueError(f'Unknown watch sources {", ".join(sorted(unknown))}')
+        with self._condition:
+            for source in sources:
+                job = Job(account, venmo, source, self.min_interval)
+                previous = self._jobs.get((account, source))
+                if previous is not None:
+                    # Dropped from the heap when next due, the new job carries on from what it saw
+                    previous.removed = True
+                    job.seen = previous.seen
+                self._jobs[(account, source)] = job
+                heapq.heappush(self._heap, (time.monotonic(), next(self._sequence), job))
+            self._condition.notify()
+
+    def remove(self, account):
+        with self._condition:
+            for key in [key for key in self._jobs if key[0] == account]:
+                self._jobs.pop(key).removed = True
+
+    def subscribe(self, callback):
+        """
+        :param callback: callable - called with every WatchEvent from the polling threads
+        """
+        self._subscribers.append(callback)
+        return callback
+
+    def async_queue(self, loop=None, maxsize=0):
+        """
+        :param loop: asyncio loop the queue is consumed on, the running one when None
+        :return: asyncio.Queue - receiving every WatchEvent
+        """
+        import asyncio
+        loop = asyncio.get_running_loop() if loop is None else loop
+        queue = asyncio.Queue(maxsize)
+        self.subscribe(lambda event: loop.call_soon_threadsafe(queue.put_nowait, event))
+        return queue
+
+    def start(self):
+        with self._condition:
+            if self._thread is None:
+                self._stopping = False
+                # A stopped executor can't be restarted, every start gets its own
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='venmo-watch')
+                self._thread = threading.Thread(target=self._run, name='venmo-watcher', daemon=True)
+                self._thread.start()
+        return self
+
+    def stop(self):
+        with self._condition:
+            self._stopping = True
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def poll(self, job):
+        """
+        Poll `job` once, emit its events and reschedule it
+        """
+        self.polls += 1
+        try:
+            listing, _, _ = SOURCES[job.source]
+            items = listing(job.venmo).get('data') or ()
+        except Exception as e:
+            events = [WatchEvent(job.account, job.source, POLL_FAILED, e)]
+            job.interval = min(self.max_interval, job.interval * self.backoff)
+        else:
+            events, current = diff(job.account, job.source, job.seen or {}, items)
+            if job.seen is None and not self.emit_initial:
+                events = []
+            job.seen = current
+            job.interval = self.min_interval if events else min(self.max_interval, job.interval * self.backoff)
+        try:
+            for event in events:
+                self._emit(event)
+        finally:
+            with self._condition:
+                # Kept through a stop too, so the job carries on when the Watcher is started again
+                if not job.removed:
+                    heapq.heappush(self._heap, (time.monotonic() + job.interval, next(self._sequence), job))
+                    self._condition.notify()
+        return events
+
+    def _emit(self, event):
+        for callback in self._subscribers:
+            try:
+                callback(event)
+            except Exception:
+                # One failing subscriber doesn't keep the event from the others or stop the source
+                log.exception('Watcher subscriber %r failed on %s', callback, event.kind)
+
+    def _run(self):
+        with self._condition:
+            while not self._stopping:
+                if not self._heap:
+                    self._condition.wait()
+                    continue
+                due, _, job = self._heap[0]
+                wait = due - time.monotonic()
+                if wait > 0:
+                    self._condition.wait(wait)
+                    continue
+                heapq.heappop(self._heap)
+                if not job.removed:
+                    self._executor.submit(self.poll, job)